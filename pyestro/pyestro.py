@@ -1,16 +1,13 @@
 #!/usr/bin/env python3
 """
 Entry point script for Pyestro.
-"""
-
-import sys
-from pathlib import Path
 
-# Add the project root to Python path
-project_root = Path(__file__).parent
-sys.path.insert(0, str(project_root))
-
-from pyestro.cli.main import cli
+Installed copies use the ``pyestro`` console script declared in
+pyproject.toml. When run directly, Python already puts this script's
+directory first on sys.path, so the package imports without any path
+manipulation.
+"""
 
 if __name__ == "__main__":
+    from pyestro.cli.main import cli
     cli()
@@ -6,6 +6,9 @@ to manage multiple server environments using different configuration
 management systems.
 """
 
+# Keep this module free of imports: it is executed on every CLI start,
+# including the --help and --version paths.
+
 __version__ = "2.0.0"
 __author__ = "Maestro Contributors"
 __license__ = "GPL-3.0"
@@ -2,22 +2,38 @@
 Main CLI entry point for Pyestro.
 """
 
+from __future__ import annotations
+
+import os
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-# Simple CLI without click dependency for now
-from ..core.config import ConfigManager, MaestroConfig
-from ..core.git import GitManager
-from ..core.file_ops import FileManager
-from ..core.templates import ProjectGenerator
-from ..parsers.reclass_parser import ReclassManager
-from ..integrations.ansible import AnsibleManager
+# Simple CLI without click dependency for now. Command implementations are
+# imported inside the cmd_* handlers so --help/--version stay cheap.
+if TYPE_CHECKING:
+    from ..core.config import ConfigManager, MaestroConfig
+    from ..core.git import GitManager
+    from ..integrations.ansible import AnsibleManager
 
+# Global option token -> parse action
+_GLOBAL_OPTIONS = {
+    "-h": "help",
+    "--help": "help",
+    "-V": "version",
+    "--version": "version",
+    "-v": "verbose",
+    "--verbose": "verbose",
+    "-q": "quiet",
+    "--quiet": "quiet",
+    "-n": "dry_run",
+    "--dry-run": "dry_run",
+    "-c": "config",
+    "--config": "config",
+    "--force-pull": "force_pull",
+}
 
-def print_usage() -> None:
-    """Print usage information."""
-    print("""
+_USAGE = """
 Pyestro - Python Configuration Management Orchestrator
 
 Usage: pyestro [options] command [arguments]
@@ -43,7 +59,9 @@ Commands:
 Options:
   -c, --config FILE      Configuration file path
   -v, --verbose          Verbose output (can be used multiple times)
+  -q, --quiet            Only show warnings and errors
   -n, --dry-run          Dry run mode
+  --force-pull           Pull existing repositories even if updated recently
   -h, --help             Show this help message
 
 Examples:
@@ -58,7 +76,13 @@ Examples:
   pyestro status
   pyestro git init
   pyestro git status
-""")
+
+"""
+
+
+def print_usage() -> None:
+    """Print usage information."""
+    sys.stdout.write(_USAGE)
 
 
 def print_version() -> None:
@@ -70,40 +94,76 @@ def print_version() -> None:
 class CLI:
     """Simple CLI handler."""
     
+    # Command name -> accessor for the bound handler
+    DISPATCH = {
+        "create": lambda self: self.cmd_create,
+        "setup": lambda self: self.cmd_setup,
+        "init": lambda self: self.cmd_init,
+        "config": lambda self: self.cmd_config,
+        "nodes": lambda self: self.cmd_nodes,
+        "ansible": lambda self: self.cmd_ansible,
+        "status": lambda self: self.cmd_status,
+        "merge": lambda self: self.cmd_merge,
+        "search": lambda self: self.cmd_search,
+        "migrate": lambda self: self.cmd_migrate,
+        "git": lambda self: self.cmd_git,
+    }
+    
     def __init__(self):
-        self.config_manager = ConfigManager()
+        self.config_path: Optional[Path] = None
+        self._config_manager: Optional[ConfigManager] = None
         self.config: Optional[MaestroConfig] = None
+        self._ansible: Optional[AnsibleManager] = None
         self.verbose = 0
+        self.quiet = False
         self.dry_run = False
+        self.force_pull = False
+    
+    @property
+    def config_manager(self) -> ConfigManager:
+        """Get the configuration manager, creating it on first use."""
+        if self._config_manager is None:
+            from ..core.config import ConfigManager
+            self._config_manager = ConfigManager(self.config_path)
+        return self._config_manager
     
     def parse_args(self, args: list[str]) -> tuple[str, list[str]]:
         """Parse command line arguments."""
         if not args:
             return "help", []
         
+        # Fast path for a lone `--help` / `--version`
+        if len(args) == 1:
+            action = _GLOBAL_OPTIONS.get(args[0])
+            if action == "help" or action == "version":
+                return action, []
+        
         # Handle global options
         filtered_args = []
         i = 0
         while i < len(args):
             arg = args[i]
-            if arg in ('-h', '--help'):
-                return "help", []
-            elif arg in ('-V', '--version'):
-                return "version", []
-            elif arg in ('-v', '--verbose'):
+            action = _GLOBAL_OPTIONS.get(arg)
+            if action is None:
+                filtered_args.append(arg)
+            elif action == "help" or action == "version":
+                return action, []
+            elif action == "verbose":
                 self.verbose += 1
-            elif arg in ('-n', '--dry-run'):
+            elif action == "quiet":
+                self.quiet = True
+            elif action == "dry_run":
                 self.dry_run = True
-            elif arg in ('-c', '--config'):
+            elif action == "force_pull":
+                self.force_pull = True
+            elif action == "config":
                 if i + 1 < len(args):
-                    config_path = Path(args[i + 1])
-                    self.config_manager = ConfigManager(config_path)
+                    self.config_path = Path(args[i + 1])
+                    self._config_manager = None
                     i += 1  # Skip next argument
                 else:
                     print("Error: --config requires a file path")
                     return "help", []
-            else:
-                filtered_args.append(arg)
             i += 1
         
         if not filtered_args:
@@ -114,14 +174,43 @@ class CLI:
         
         return command, command_args
     
+    @property
+    def config_loaded(self) -> bool:
+        """Whether the configuration has already been loaded."""
+        return self.config is not None
+    
     def load_config(self) -> None:
-        """Load configuration."""
+        """Load configuration (once per CLI instance)."""
+        if self.config is not None:
+            return
+        
         self.config = self.config_manager.load_config()
         if self.dry_run:
             self.config.dry_run = True
         if self.verbose:
             self.config.verbose = self.verbose
     
+    def _require_ansible(self) -> Optional[AnsibleManager]:
+        """Get the Ansible manager for the loaded configuration, creating it once."""
+        if self._ansible is None:
+            self.load_config()
+            if not self.config:
+                return None
+            from ..integrations.ansible import AnsibleManager
+            self._ansible = AnsibleManager(self.config)
+        return self._ansible
+    
+    def _git_manager(self) -> GitManager:
+        """Create a GitManager for the loaded configuration.
+        
+        --force-pull disables the recent-pull skip; otherwise GitManager's
+        default pull TTL applies.
+        """
+        from ..core.git import GitManager
+        if self.force_pull:
+            return GitManager(self.config.dry_run, pull_ttl=0)
+        return GitManager(self.config.dry_run)
+    
     def cmd_init(self, args: list[str]) -> int:
         """Initialize new project."""
         print("Initializing new Pyestro project...")
@@ -162,8 +251,9 @@ class CLI:
             
             print("Current configuration:")
             config_dict = self.config.to_dict()
-            for key, value in config_dict.items():
-                print(f"  {key}: {value}")
+            sys.stdout.write(
+                "".join(f"  {key}: {value}\n" for key, value in config_dict.items())
+            )
             return 0
         
         elif subcommand == "validate":
@@ -193,6 +283,8 @@ class CLI:
                 print("Error: Could not load configuration")
                 return 1
             
+            from ..parsers.reclass_parser import ReclassManager
+            
             # Initialize reclass manager
             reclass_mgr = ReclassManager(
                 self.config.merged_inventory_dir,
@@ -207,8 +299,7 @@ class CLI:
             )
             if nodes:
                 print(f"Available nodes ({len(nodes)}):")
-                for node in nodes:
-                    print(f"  {node}")
+                sys.stdout.write("".join(f"  {node}\n" for node in nodes))
             else:
                 print("No nodes found")
             return 0
@@ -218,6 +309,8 @@ class CLI:
                 print("Error: nodes show requires node name")
                 return 1
             
+            from ..parsers.reclass_parser import ReclassManager
+            
             node_name = args[1]
             reclass_mgr = ReclassManager(
                 self.config.merged_inventory_dir,
@@ -226,12 +319,17 @@ class CLI:
             
             node_data = reclass_mgr.get_node_data(node_name)
             if node_data:
-                print(f"Node: {node_name}")
-                print(f"Classes: {node_data.get('classes', [])}")
-                print(f"Applications: {node_data.get('applications', [])}")
-                print("Parameters:")
-                for key, value in node_data.get('parameters', {}).items():
-                    print(f"  {key}: {value}")
+                lines = [
+                    f"Node: {node_name}",
+                    f"Classes: {node_data.get('classes', [])}",
+                    f"Applications: {node_data.get('applications', [])}",
+                    "Parameters:",
+                ]
+                lines.extend(
+                    f"  {key}: {value}"
+                    for key, value in node_data.get('parameters', {}).items()
+                )
+                sys.stdout.write("\n".join(lines) + "\n")
             else:
                 print(f"Node not found: {node_name}")
                 return 1
@@ -246,14 +344,11 @@ class CLI:
             print("Error: ansible command requires module name")
             return 1
         
-        self.load_config()
-        if not self.config:
+        ansible_mgr = self._require_ansible()
+        if not ansible_mgr:
             print("Error: Could not load configuration")
             return 1
         
-        from ..core.ansible import AnsibleManager
-        ansible_mgr = AnsibleManager(self.config)
-        
         if args[0] == "playbook":
             if len(args) < 2:
                 print("Error: ansible playbook requires playbook path")
@@ -278,9 +373,8 @@ class CLI:
                         i += 1
                 elif arg.startswith("-e") or arg == "--extra-vars":
                     if i + 1 < len(extra_args):
-                        var_pair = extra_args[i + 1]
-                        if "=" in var_pair:
-                            key, value = var_pair.split("=", 1)
+                        key, sep, value = extra_args[i + 1].partition("=")
+                        if sep:
                             extra_vars[key] = value
                         i += 1
                 i += 1
@@ -303,18 +397,18 @@ class CLI:
     
     def cmd_status(self, args: list[str]) -> int:
         """Check host connectivity."""
-        self.load_config()
-        if not self.config:
+        ansible_mgr = self._require_ansible()
+        if not ansible_mgr:
             print("Error: Could not load configuration")
             return 1
         
-        from ..core.ansible import AnsibleManager
-        ansible_mgr = AnsibleManager(self.config)
-        
         print("Checking host connectivity...")
-        success = ansible_mgr.ping_hosts()
+        connectivity = ansible_mgr.test_connectivity()
+        
+        for host, reachable in connectivity.items():
+            print(f"  {host}: {'reachable' if reachable else 'UNREACHABLE'}")
         
-        if success:
+        if connectivity and all(connectivity.values()):
             print("Host connectivity check completed")
             return 0
         else:
@@ -351,7 +445,7 @@ class CLI:
         else:
             bash_config_path = Path(args[1])
         
-        if not bash_config_path.exists():
+        if not os.path.exists(bash_config_path):
             print(f"Error: Bash config file not found: {bash_config_path}")
             return 1
         
@@ -377,8 +471,7 @@ class CLI:
             print("Error: Could not load configuration")
             return 1
         
-        from ..core.git import GitManager
-        git_mgr = GitManager(self.config.dry_run)
+        git_mgr = self._git_manager()
         
         if subcommand == "init":
             # Clone all configured repositories
@@ -399,10 +492,11 @@ class CLI:
             # Show status of all repositories
             print("Repository status:")
             repo_configs = self.config.get_repository_configs()
+            repo_dirs = [self.config.maestro_dir / rc.name for rc in repo_configs]
+            statuses = git_mgr.get_repositories_status(repo_dirs)
             
-            for repo_config in repo_configs:
-                repo_dir = self.config.maestro_dir / repo_config.name
-                status = git_mgr.get_repository_status(repo_dir)
+            for repo_config, repo_dir in zip(repo_configs, repo_dirs):
+                status = statuses[repo_dir]
                 
                 if status:
                     changes_str = " (uncommitted changes)" if status["has_changes"] else ""
@@ -417,10 +511,10 @@ class CLI:
             repo_configs = self.config.get_repository_configs()
             print(f"Pulling updates for {len(repo_configs)} repositories...")
             
-            for repo_config in repo_configs:
-                repo_dir = self.config.maestro_dir / repo_config.name
-                success = git_mgr.pull_repository(repo_dir)
-                print(f"  {'✓' if success else '✗'} {repo_config.name}")
+            repo_dirs = [self.config.maestro_dir / rc.name for rc in repo_configs]
+            results = git_mgr.pull_repositories(repo_dirs)
+            for repo_config, repo_dir in zip(repo_configs, repo_dirs):
+                print(f"  {'✓' if results[repo_dir] else '✗'} {repo_config.name}")
             
             return 0
         
@@ -435,11 +529,14 @@ class CLI:
             print("Error: Could not load configuration")
             return 1
         
+        from ..core.file_ops import FileManager
+        from ..core.which import find_executables
+        
         print("Setting up Pyestro project...")
         
         # Clone repositories
         print("\n1. Cloning repositories...")
-        git_mgr = GitManager(dry_run=self.config.dry_run)
+        git_mgr = self._git_manager()
         repo_configs = self.config.get_repository_configs()
         
         if repo_configs:
@@ -454,13 +551,20 @@ class CLI:
         
         # Setup directory structure
         print("\n2. Setting up directories...")
-        file_mgr = FileManager(dry_run=self.config.dry_run)
+        file_mgr = FileManager(
+            dry_run=self.config.dry_run,
+            rsync_options=self.config.rsync_options_parsed
+        )
         
         directories = [
             self.config.work_dir,
             self.config.merged_inventory_dir,
-            self.config.maestro_dir / self.config.ansible.galaxy_roles_dir
+            self.config.ansible_roles_path
         ]
+        if self.config.ansible.fact_caching == "jsonfile":
+            directories.append(
+                self.config.maestro_dir / self.config.ansible.fact_caching_connection
+            )
         
         for directory in directories:
             if file_mgr.ensure_directory(directory):
@@ -470,8 +574,8 @@ class CLI:
         
         # Create ansible.cfg
         print("\n3. Setting up Ansible configuration...")
+        ansible_mgr = self._require_ansible()
         try:
-            ansible_mgr = AnsibleManager(self.config)
             if ansible_mgr.create_ansible_cfg():
                 print("  ✓ ansible.cfg created")
             else:
@@ -482,12 +586,10 @@ class CLI:
         # Merge inventory directories
         print("\n4. Merging inventory directories...")
         if self.config.inventory_dirs:
-            source_dirs = []
-            for name, path in self.config.inventory_dirs.items():
-                if path and path != "none":
-                    source_path = Path(path)
-                    if source_path.exists():
-                        source_dirs.append(source_path)
+            source_dirs = [
+                Path(path) for path in self.config.inventory_dirs.values()
+                if path and path != "none" and os.path.isdir(path)
+            ]
             
             if source_dirs:
                 if file_mgr.merge_directories(source_dirs, self.config.merged_inventory_dir):
@@ -501,13 +603,9 @@ class CLI:
         
         # Check dependencies
         print("\n5. Checking dependencies...")
-        dependencies = {
-            "git": GitManager(dry_run=True)._find_git(),
-            "reclass": ReclassManager(self.config.merged_inventory_dir, dry_run=True)._find_reclass(),
-            "ansible": AnsibleManager(self.config)._find_ansible(),
-            "ansible-playbook": AnsibleManager(self.config)._find_ansible_playbook(),
-            "rsync": FileManager(dry_run=True)._find_rsync()
-        }
+        dependencies = find_executables(
+            ("git", "reclass", "ansible", "ansible-playbook", "rsync")
+        )
         
         for dep_name, dep_path in dependencies.items():
             if dep_path:
@@ -541,6 +639,8 @@ class CLI:
             print("       pyestro create --list")
             return 1
         
+        from ..core.templates import ProjectGenerator
+        
         # Initialize project generator
         generator = ProjectGenerator()
         
@@ -583,9 +683,8 @@ class CLI:
                     i += 2
                 elif arg.startswith("--var="):
                     # Handle --var=key=value
-                    var_part = arg[6:]  # Remove --var=
-                    if "=" in var_part:
-                        key, value = var_part.split("=", 1)
+                    key, sep, value = arg[6:].partition("=")  # Remove --var=
+                    if sep:
                         variables[key] = value
                     i += 1
                 else:
@@ -627,34 +726,18 @@ class CLI:
         elif command == "version":
             print_version()
             return 0
-        elif command == "create":
-            return self.cmd_create(command_args)
-        elif command == "setup":
-            return self.cmd_setup(command_args)
-        elif command == "init":
-            return self.cmd_init(command_args)
-        elif command == "config":
-            return self.cmd_config(command_args)
-        elif command == "nodes":
-            return self.cmd_nodes(command_args)
-        elif command == "ansible":
-            return self.cmd_ansible(command_args)
-        elif command == "status":
-            return self.cmd_status(command_args)
-        elif command == "merge":
-            return self.cmd_merge(command_args)
-        elif command == "search":
-            return self.cmd_search(command_args)
-        elif command == "migrate":
-            return self.cmd_migrate(command_args)
-        elif command == "git":
-            return self.cmd_git(command_args)
-        elif command == "setup":
-            return self.cmd_setup(command_args)
-        else:
+        
+        handler = self.DISPATCH.get(command)
+        if handler is None:
             print(f"Error: Unknown command: {command}")
             print_usage()
             return 1
+        
+        if self.quiet:
+            from ..core.config import LOG_WARNING, set_log_level
+            set_log_level(LOG_WARNING)
+        
+        return handler(self)(command_args)
 
 
 def cli() -> None:
@@ -2,12 +2,64 @@
 Ansible integration for Pyestro.
 """
 
+import json
+import os
+import shlex
 import subprocess
 import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple, Union
 from ..core.config import MaestroConfig, log_info, log_warning
 from ..core.validation import InputValidator
+from ..core.process import run_keeping_stderr_tail
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def _dumps_compact(data: Any) -> str:
+    """Serialize command-line JSON payloads without whitespace."""
+    if HAS_ORJSON:
+        return orjson.dumps(data).decode("utf-8")
+    return json.dumps(data, separators=(",", ":"))
+
+
+# ansible.cfg layout shared by both Ansible managers, compiled once per process
+_ANSIBLE_CFG_TEMPLATE = """[defaults]
+inventory = {inventory}
+host_key_checking = False
+timeout = {ansible.timeout}
+ansible_managed = {ansible.managed_banner}
+roles_path = {roles_path}
+forks = {ansible.forks}
+gathering = {ansible.gathering}
+fact_caching = {ansible.fact_caching}
+fact_caching_connection = {fact_caching_connection}
+fact_caching_timeout = {ansible.fact_caching_timeout}
+
+[ssh_connection]
+scp_if_ssh = {scp_if_ssh}
+pipelining = {pipelining}
+ssh_args = -C -o ControlMaster=auto -o ControlPersist={ansible.control_persist} -o ConnectionAttempts=5
+"""
+
+
+def render_ansible_cfg(config: MaestroConfig, roles_path: Union[str, Path]) -> str:
+    """Render the ansible.cfg content for a configuration."""
+    return _ANSIBLE_CFG_TEMPLATE.format(
+        inventory=config.inventory_hosts_path,
+        ansible=config.ansible,
+        roles_path=roles_path,
+        fact_caching_connection=config.maestro_dir / config.ansible.fact_caching_connection,
+        scp_if_ssh="True" if config.ansible.scp_if_ssh else "False",
+        pipelining="True" if config.ansible.pipelining else "False"
+    )
 
 
 class AnsibleManager:
@@ -17,16 +69,22 @@ class AnsibleManager:
         self.config = config
         self.ansible_path = self._find_ansible()
         self.ansible_playbook_path = self._find_ansible_playbook()
+        # Checked once per manager, i.e. once per command invocation
+        self._inventory_exists = config.inventory_hosts_path.exists()
     
-    def _find_ansible(self) -> Optional[str]:
-        """Find ansible executable."""
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _find_ansible() -> Optional[str]:
+        """Find ansible executable (looked up once per process)."""
         ansible_path = shutil.which("ansible")
         if not ansible_path:
             log_warning("ansible executable not found")
         return ansible_path
     
-    def _find_ansible_playbook(self) -> Optional[str]:
-        """Find ansible-playbook executable."""
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _find_ansible_playbook() -> Optional[str]:
+        """Find ansible-playbook executable (looked up once per process)."""
         ansible_playbook_path = shutil.which("ansible-playbook")
         if not ansible_playbook_path:
             log_warning("ansible-playbook executable not found")
@@ -35,11 +93,15 @@ class AnsibleManager:
     def execute_module(
         self,
         module_name: str,
-        module_args: List[str],
+        module_args: Union[List[str], Dict[str, Any]],
         hosts: str = "all",
         extra_vars: Optional[Dict[str, str]] = None
     ) -> bool:
-        """Execute an Ansible module."""
+        """Execute an Ansible module.
+        
+        ``module_args`` is either a list of ``key=value`` strings or a dict,
+        which is passed to Ansible as JSON without any re-quoting.
+        """
         if not self.ansible_path:
             log_warning("Cannot execute ansible module: ansible not available")
             return False
@@ -47,7 +109,8 @@ class AnsibleManager:
         # Validate inputs
         try:
             module_name = InputValidator.validate_ansible_module_name(module_name)
-            module_args = InputValidator.sanitize_command_args(module_args)
+            if not isinstance(module_args, dict):
+                module_args = InputValidator.sanitize_command_args(module_args)
         except Exception as e:
             log_warning(f"Invalid module or arguments: {e}")
             return False
@@ -56,18 +119,19 @@ class AnsibleManager:
         cmd = [self.ansible_path, hosts, "-m", module_name]
         
         # Add module arguments
-        if module_args:
-            cmd.extend(["-a", " ".join(module_args)])
+        if isinstance(module_args, dict):
+            if module_args:
+                cmd += ["-a", _dumps_compact(module_args)]
+        elif module_args:
+            cmd += ["-a", " ".join(module_args)]
         
-        # Add extra variables
+        # Add extra variables as JSON so values keep their spaces and quotes
         if extra_vars:
-            extra_vars_str = " ".join([f"{k}={v}" for k, v in extra_vars.items()])
-            cmd.extend(["-e", extra_vars_str])
+            cmd += ["-e", _dumps_compact(extra_vars)]
         
         # Add inventory
-        inventory_path = self.config.merged_inventory_dir / "hosts"
-        if inventory_path.exists():
-            cmd.extend(["-i", str(inventory_path)])
+        if self._inventory_exists:
+            cmd.extend(["-i", str(self.config.inventory_hosts_path)])
         
         # Add verbosity
         if self.config.verbose > 1:
@@ -76,7 +140,7 @@ class AnsibleManager:
         log_info(f"Executing Ansible module: {module_name}")
         
         if self.config.dry_run:
-            log_info(f"DRY RUN: Would execute: {' '.join(cmd)}")
+            log_info(f"DRY RUN: Would execute: {shlex.join(cmd)}")
             return True
         
         try:
@@ -97,9 +161,17 @@ class AnsibleManager:
         hosts: Optional[str] = None,
         extra_vars: Optional[Dict[str, str]] = None,
         tags: Optional[List[str]] = None,
-        skip_tags: Optional[List[str]] = None
+        skip_tags: Optional[List[str]] = None,
+        forks: Optional[int] = None,
+        strategy: Optional[str] = None,
+        serial: Optional[str] = None
     ) -> bool:
-        """Run an Ansible playbook."""
+        """Run an Ansible playbook.
+        
+        ``strategy`` overrides the play strategy (e.g. ``free``) via
+        ANSIBLE_STRATEGY; ``serial`` is passed as the ``batch_serial`` extra
+        variable for plays that use ``serial: "{{ batch_serial }}"``.
+        """
         if not self.ansible_playbook_path:
             log_warning("Cannot run playbook: ansible-playbook not available")
             return False
@@ -112,9 +184,8 @@ class AnsibleManager:
         cmd = [self.ansible_playbook_path, str(playbook_path)]
         
         # Add inventory
-        inventory_path = self.config.merged_inventory_dir / "hosts"
-        if inventory_path.exists():
-            cmd.extend(["-i", str(inventory_path)])
+        if self._inventory_exists:
+            cmd.extend(["-i", str(self.config.inventory_hosts_path)])
         
         # Limit to specific hosts
         if hosts:
@@ -125,10 +196,15 @@ class AnsibleManager:
                 log_warning(f"Invalid hosts pattern: {e}")
                 return False
         
-        # Add extra variables
+        # Add extra variables as JSON so values keep their spaces and quotes
         if extra_vars:
-            extra_vars_str = " ".join([f"{k}={v}" for k, v in extra_vars.items()])
-            cmd.extend(["-e", extra_vars_str])
+            cmd += ["-e", _dumps_compact(extra_vars)]
+        
+        if serial:
+            cmd.extend(["-e", f"batch_serial={serial}"])
+        
+        # Number of hosts to run against in parallel
+        cmd.extend(["--forks", str(forks or self.config.ansible.forks)])
         
         # Add tags
         if tags:
@@ -147,11 +223,14 @@ class AnsibleManager:
         
         log_info(f"Running Ansible playbook: {playbook_path}")
         
+        env = {**os.environ, "ANSIBLE_STRATEGY": strategy} if strategy else None
+        
         try:
             result = subprocess.run(
                 cmd,
                 check=True,
-                text=True
+                text=True,
+                env=env
             )
             log_info(f"Playbook {playbook_path} executed successfully")
             return True
@@ -159,6 +238,25 @@ class AnsibleManager:
             log_warning(f"Playbook {playbook_path} failed: {e}")
             return False
     
+    def run_playbooks(
+        self,
+        jobs: List[Dict[str, Any]],
+        max_concurrency: Optional[int] = None
+    ) -> List[bool]:
+        """Run independent playbooks concurrently.
+        
+        Each job is a dict of ``run_playbook`` keyword arguments. Results are
+        returned in job order. ``max_concurrency`` defaults to the controller's
+        CPU count, since every ansible-playbook process forks its own workers.
+        """
+        if not jobs:
+            return []
+        
+        workers = min(max_concurrency or os.cpu_count() or 1, len(jobs))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(self.run_playbook, **job) for job in jobs]
+            return [future.result() for future in futures]
+    
     def list_playbooks(self) -> List[Path]:
         """List available playbooks."""
         playbooks = []
@@ -167,39 +265,104 @@ class AnsibleManager:
             if playbook_dir_path == "none":
                 continue
             
-            playbook_dir = Path(playbook_dir_path)
-            if playbook_dir.exists():
-                # Find .yml and .yaml files
-                for playbook_file in playbook_dir.rglob("*.yml"):
-                    playbooks.append(playbook_file)
-                for playbook_file in playbook_dir.rglob("*.yaml"):
-                    playbooks.append(playbook_file)
+            # Find .yml and .yaml files in a single scandir walk
+            pending = [playbook_dir_path]
+            while pending:
+                try:
+                    with os.scandir(pending.pop()) as entries:
+                        for entry in entries:
+                            if entry.is_dir(follow_symlinks=False):
+                                pending.append(entry.path)
+                            elif entry.name.endswith((".yml", ".yaml")) and entry.is_file():
+                                playbooks.append(Path(entry.path))
+                except OSError:
+                    continue
         
         return sorted(playbooks)
     
+    def execute_modules(
+        self,
+        modules: List[Tuple[str, Union[List[str], Dict[str, Any]]]],
+        hosts: str = "all"
+    ) -> bool:
+        """Execute several Ansible modules in a single ansible-playbook run.
+        
+        Each ``(module_name, module_args)`` pair becomes one task of a
+        temporary playbook, so Ansible starts and builds the inventory once
+        instead of once per module. A single module runs ad hoc.
+        """
+        if len(modules) == 1:
+            module_name, module_args = modules[0]
+            return self.execute_module(module_name, module_args, hosts)
+        
+        if not self.ansible_playbook_path:
+            log_warning("Cannot execute ansible modules: ansible-playbook not available")
+            return False
+        
+        # Validate inputs
+        tasks = []
+        try:
+            hosts = InputValidator.sanitize_shell_input(hosts)
+            for module_name, module_args in modules:
+                module_name = InputValidator.validate_ansible_module_name(module_name)
+                if not isinstance(module_args, dict):
+                    module_args = " ".join(
+                        InputValidator.sanitize_command_args(module_args)
+                    )
+                tasks.append({"name": module_name, module_name: module_args or None})
+        except Exception as e:
+            log_warning(f"Invalid module or arguments: {e}")
+            return False
+        
+        # JSON is valid YAML, so no YAML library is needed for the playbook
+        play = [{"hosts": hosts, "gather_facts": False, "tasks": tasks}]
+        
+        if self.config.dry_run:
+            log_info(f"DRY RUN: Would execute: {self.ansible_playbook_path} <batch playbook>")
+            log_info(f"DRY RUN: Batch playbook: {_dumps_compact(play)}")
+            return True
+        
+        # A unique file per call, so concurrent batches cannot clobber each other
+        playbook_path = None
+        try:
+            self.config.work_dir.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                dir=self.config.work_dir, prefix=".batch_play_", suffix=".yml", delete=False
+            ) as f:
+                playbook_path = Path(f.name)
+                if HAS_ORJSON:
+                    f.write(orjson.dumps(play, option=orjson.OPT_INDENT_2))
+                else:
+                    f.write(json.dumps(play, indent=2).encode("utf-8"))
+        except OSError as e:
+            log_warning(f"Failed to write batch playbook: {e}")
+            if playbook_path:
+                playbook_path.unlink(missing_ok=True)
+            return False
+        
+        try:
+            return self.run_playbook(playbook_path)
+        finally:
+            playbook_path.unlink(missing_ok=True)
+    
     def ping_hosts(self, hosts: str = "all") -> bool:
         """Ping hosts to check connectivity."""
-        return self.execute_module("ping", [], hosts)
+        return self.execute_modules([("ping", [])], hosts)
     
     def gather_facts(self, hosts: str = "all") -> bool:
         """Gather facts from hosts."""
-        return self.execute_module("setup", [], hosts)
+        return self.execute_modules([("setup", [])], hosts)
+    
+    def ping_and_gather_facts(self, hosts: str = "all") -> bool:
+        """Check connectivity and gather facts in one Ansible run."""
+        return self.execute_modules([("ping", []), ("setup", [])], hosts)
     
     def create_ansible_cfg(self, output_path: Optional[Path] = None) -> Path:
         """Create ansible.cfg file with appropriate settings."""
         if not output_path:
             output_path = self.config.maestro_dir / "ansible.cfg"
         
-        config_content = f"""[defaults]
-inventory = {self.config.merged_inventory_dir / "hosts"}
-host_key_checking = False
-timeout = {self.config.ansible.timeout}
-ansible_managed = {self.config.ansible.managed_banner}
-roles_path = {self.config.maestro_dir / self.config.ansible.galaxy_roles_dir}
-
-[ssh_connection]
-scp_if_ssh = {'True' if self.config.ansible.scp_if_ssh else 'False'}
-"""
+        config_content = render_ansible_cfg(self.config, self.config.ansible_roles_path)
         
         log_info(f"Creating ansible.cfg at {output_path}")
         
@@ -208,8 +371,7 @@ scp_if_ssh = {'True' if self.config.ansible.scp_if_ssh else 'False'}
             return output_path
         
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(config_content)
+            output_path.write_bytes(config_content.encode("utf-8"))
             log_info(f"Created ansible.cfg at {output_path}")
             return output_path
         except Exception as e:
@@ -230,15 +392,10 @@ scp_if_ssh = {'True' if self.config.ansible.scp_if_ssh else 'False'}
         
         log_info(f"Validating playbook syntax: {playbook_path}")
         
-        try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            log_info(f"Playbook {playbook_path} syntax is valid")
-            return True
-        except subprocess.CalledProcessError as e:
-            log_warning(f"Playbook {playbook_path} syntax check failed: {e.stderr}")
+        returncode, stderr = run_keeping_stderr_tail(cmd)
+        if returncode != 0:
+            log_warning(f"Playbook {playbook_path} syntax check failed: {stderr}")
             return False
+        
+        log_info(f"Playbook {playbook_path} syntax is valid")
+        return True
@@ -3,25 +3,96 @@ Core configuration management for Pyestro.
 """
 
 import json
+import os
+import re
+import sys
+import threading
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import yaml
+    # Prefer the libyaml-backed loader; the pure-Python one is far slower
+    YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    HAS_YAML = True
+except ImportError:
+    HAS_YAML = False
+
+# Accepted repository URL forms: http(s), git and ssh URLs, or scp-like git@host:path
+_REPO_URL_RE = re.compile(r"(?:https?|git|ssh)://|git@")
 
 # Simple logging until we have proper dependencies
+LOG_WARNING = 0
+LOG_INFO = 1
+_log_level = LOG_INFO
+_log_lock = threading.Lock()
+
+def set_log_level(level: int) -> None:
+    """Set the logging threshold; LOG_WARNING silences info messages."""
+    global _log_level
+    _log_level = level
+
+def info_enabled() -> bool:
+    """Whether log_info output is shown; lets callers skip building messages."""
+    return _log_level >= LOG_INFO
+
 def log_info(msg: str, **kwargs: Any) -> None:
-    print(f"INFO: {msg}", kwargs if kwargs else "")
+    if _log_level >= LOG_INFO:
+        line = f"INFO: {msg} {kwargs}\n" if kwargs else f"INFO: {msg}\n"
+        # Look up sys.stdout on each call so redirection keeps working; the
+        # lock keeps lines from worker threads from interleaving
+        with _log_lock:
+            sys.stdout.write(line)
 
 def log_warning(msg: str, **kwargs: Any) -> None:
-    print(f"WARNING: {msg}", kwargs if kwargs else "")
+    line = f"WARNING: {msg} {kwargs}\n" if kwargs else f"WARNING: {msg}\n"
+    with _log_lock:
+        sys.stdout.write(line)
+
+
+@lru_cache(maxsize=64)
+def _resolve_path(path: str, cwd: Optional[str]) -> Path:
+    """Expand and canonicalize a path; ``cwd`` is only part of the cache key."""
+    return Path(os.path.realpath(os.path.expanduser(path)))
+
+
+def _resolve(path: Union[str, Path]) -> Path:
+    """Cached equivalent of ``Path(path).expanduser().resolve()``."""
+    path = os.fspath(path)
+    # Relative paths depend on the working directory, so key them on it too
+    absolute = os.path.isabs(path) or path.startswith("~")
+    return _resolve_path(path, None if absolute else os.getcwd())
 
 
 class RepositoryConfig:
     """Configuration for Git repositories."""
     
-    def __init__(self, name: str, url: str, branch: str = "main", verify_ssl: bool = True):
+    def __init__(
+        self,
+        name: str,
+        url: str,
+        branch: str = "main",
+        verify_ssl: bool = True,
+        shallow: bool = True,
+        submodule_jobs: Optional[int] = None,
+        blobless: bool = False
+    ):
         self.name = name
         self.url = url
         self.branch = branch
         self.verify_ssl = verify_ssl
+        # Clone only the tip of the branch; Pyestro never needs the history
+        self.shallow = shallow
+        self.submodule_jobs = submodule_jobs
+        # Partial clone that fetches file contents on demand
+        self.blobless = blobless
 
 
 class AnsibleConfig:
@@ -33,13 +104,27 @@ class AnsibleConfig:
         managed_banner: str = "Ansible managed. All local changes will be lost!",
         timeout: int = 60,
         scp_if_ssh: bool = True,
-        galaxy_roles_dir: str = ".ansible-galaxy-roles"
+        galaxy_roles_dir: str = ".ansible-galaxy-roles",
+        forks: int = 20,
+        pipelining: bool = True,
+        control_persist: str = "60s",
+        gathering: str = "smart",
+        fact_caching: str = "jsonfile",
+        fact_caching_connection: str = ".ansible-fact-cache",
+        fact_caching_timeout: int = 7200
     ):
         self.config_file = config_file
         self.managed_banner = managed_banner
         self.timeout = timeout
         self.scp_if_ssh = scp_if_ssh
         self.galaxy_roles_dir = galaxy_roles_dir
+        self.forks = forks
+        self.pipelining = pipelining
+        self.control_persist = control_persist
+        self.gathering = gathering
+        self.fact_caching = fact_caching
+        self.fact_caching_connection = fact_caching_connection
+        self.fact_caching_timeout = fact_caching_timeout
 
 
 class MaestroConfig:
@@ -58,14 +143,17 @@ class MaestroConfig:
         local_dirs: Optional[Dict[str, str]] = None,
         ansible: Optional[AnsibleConfig] = None,
         rsync_options: str = "-a -m --exclude=.keep",
+        shallow_clone: bool = True,
+        blobless_clone: bool = False,
+        submodule_jobs: Optional[int] = None,
         node_filter: Optional[str] = None,
         class_filter: Optional[str] = None,
         project_filter: Optional[str] = None,
         **kwargs: Any
     ):
         # Core directories
-        self.maestro_dir = Path(maestro_dir or Path.cwd()).expanduser().resolve()
-        self.work_dir = Path(work_dir).expanduser().resolve()
+        self.maestro_dir = _resolve(maestro_dir or os.getcwd())
+        self.work_dir = _resolve(work_dir)
         
         # Behavior settings
         self.dry_run = dry_run
@@ -85,6 +173,12 @@ class MaestroConfig:
         
         # Rsync options
         self.rsync_options = rsync_options
+        self.rsync_options_parsed: Tuple[str, ...] = tuple(rsync_options.split())
+        
+        # Git clone behaviour
+        self.shallow_clone = shallow_clone
+        self.blobless_clone = blobless_clone
+        self.submodule_jobs = submodule_jobs
         
         # Filtering
         self.node_filter = node_filter
@@ -99,9 +193,7 @@ class MaestroConfig:
         for name, url in self.repositories.items():
             if not url or not isinstance(url, str):
                 raise ValueError(f"Invalid repository URL for {name}: {url}")
-            # Basic URL validation
-            if not (url.startswith(('http://', 'https://', 'git://', 'ssh://')) or 
-                   url.startswith('git@')):
+            if not _REPO_URL_RE.match(url):
                 raise ValueError(f"Invalid repository URL format for {name}: {url}")
         
         # Validate directory mappings
@@ -114,16 +206,32 @@ class MaestroConfig:
                 if not isinstance(path, str):
                     raise ValueError(f"Directory path must be string for {name} in {mapping_name}: {path}")
     
-    @property
+    @cached_property
     def merged_inventory_dir(self) -> Path:
         """Get the merged inventory directory path."""
         return self.work_dir / "inventory"
     
+    @cached_property
+    def inventory_hosts_path(self) -> Path:
+        """Get the Ansible hosts file inside the merged inventory."""
+        return self.merged_inventory_dir / "hosts"
+    
+    @cached_property
+    def ansible_roles_path(self) -> Path:
+        """Get the Galaxy roles directory."""
+        return self.maestro_dir / self.ansible.galaxy_roles_dir
+    
     def get_repository_configs(self) -> List[RepositoryConfig]:
         """Get repository configurations."""
         configs = []
         for name, url in self.repositories.items():
-            configs.append(RepositoryConfig(name=name, url=url))
+            configs.append(RepositoryConfig(
+                name=name,
+                url=url,
+                shallow=self.shallow_clone,
+                submodule_jobs=self.submodule_jobs,
+                blobless=self.blobless_clone,
+            ))
         return configs
     
     def get_storage_dirs(self) -> List[Path]:
@@ -155,8 +263,18 @@ class MaestroConfig:
                 'timeout': self.ansible.timeout,
                 'scp_if_ssh': self.ansible.scp_if_ssh,
                 'galaxy_roles_dir': self.ansible.galaxy_roles_dir,
+                'forks': self.ansible.forks,
+                'pipelining': self.ansible.pipelining,
+                'control_persist': self.ansible.control_persist,
+                'gathering': self.ansible.gathering,
+                'fact_caching': self.ansible.fact_caching,
+                'fact_caching_connection': self.ansible.fact_caching_connection,
+                'fact_caching_timeout': self.ansible.fact_caching_timeout,
             },
             'rsync_options': self.rsync_options,
+            'shallow_clone': self.shallow_clone,
+            'blobless_clone': self.blobless_clone,
+            'submodule_jobs': self.submodule_jobs,
             'node_filter': self.node_filter,
             'class_filter': self.class_filter,
             'project_filter': self.project_filter,
@@ -197,21 +315,34 @@ class ConfigManager:
     def _find_config_file(self) -> Optional[Path]:
         """Find configuration file in current directory."""
         cwd = Path.cwd()
+        
+        # One directory listing instead of a stat per candidate name
+        try:
+            with os.scandir(cwd) as entries:
+                # is_file() follows symlinks, so linked config files still count
+                present = {entry.name for entry in entries if entry.is_file()}
+        except OSError:
+            return None
+        
         for name in self.DEFAULT_CONFIG_NAMES:
-            config_path = cwd / name
-            if config_path.exists():
-                return config_path
+            if name in present:
+                return cwd / name
         return None
     
     def _load_from_file(self, config_path: Path) -> MaestroConfig:
         """Load configuration from YAML/JSON file."""
         try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                if config_path.suffix.lower() in ('.yaml', '.yml'):
-                    # For now, use JSON format until we add YAML dependency
+            # Parse the raw bytes; orjson.JSONDecodeError subclasses json's
+            raw = config_path.read_bytes()
+            
+            if config_path.suffix.lower() in ('.yaml', '.yml'):
+                if not HAS_YAML:
                     raise ValueError("YAML support requires PyYAML. Please use JSON format or install dependencies.")
-                else:
-                    data = json.load(f)
+                if YamlLoader is yaml.SafeLoader:
+                    log_warning("PyYAML was built without libyaml; YAML parsing will be slow")
+                data = yaml.load(raw, Loader=YamlLoader) or {}
+            else:
+                data = orjson.loads(raw) if HAS_ORJSON else json.loads(raw)
             
             # Convert relative paths to absolute
             if 'maestro_dir' not in data:
@@ -225,7 +356,14 @@ class ConfigManager:
                     managed_banner=ansible_data.get('managed_banner', "Ansible managed. All local changes will be lost!"),
                     timeout=ansible_data.get('timeout', 60),
                     scp_if_ssh=ansible_data.get('scp_if_ssh', True),
-                    galaxy_roles_dir=ansible_data.get('galaxy_roles_dir', ".ansible-galaxy-roles")
+                    galaxy_roles_dir=ansible_data.get('galaxy_roles_dir', ".ansible-galaxy-roles"),
+                    forks=ansible_data.get('forks', 20),
+                    pipelining=ansible_data.get('pipelining', True),
+                    control_persist=ansible_data.get('control_persist', "60s"),
+                    gathering=ansible_data.get('gathering', "smart"),
+                    fact_caching=ansible_data.get('fact_caching', "jsonfile"),
+                    fact_caching_connection=ansible_data.get('fact_caching_connection', ".ansible-fact-cache"),
+                    fact_caching_timeout=ansible_data.get('fact_caching_timeout', 7200)
                 )
             
             self._config = MaestroConfig(**data)
@@ -266,8 +404,13 @@ class ConfigManager:
         # Convert to serializable dict
         data = config.to_dict()
         
-        with open(config_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, sort_keys=True)
+        if HAS_ORJSON:
+            config_path.write_bytes(
+                orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS)
+            )
+        else:
+            with open(config_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, sort_keys=True)
         
         log_info("Configuration saved", path=str(config_path))
     
@@ -2,22 +2,42 @@
 File operations and synchronization for Pyestro.
 """
 
+import errno
+import os
 import shutil
-import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Sequence, Union
 from ..core.config import log_info, log_warning
+from ..core.process import run_keeping_stderr_tail
+
+# In-kernel copy primitives, tried in order; both use and advance the fd offsets
+_copy_file_range = getattr(os, "copy_file_range", None)
+_sendfile = (
+    (lambda src_fd, dst_fd, count: os.sendfile(dst_fd, src_fd, None, count))
+    if hasattr(os, "sendfile") else None
+)
+_COPY_FALLBACK_ERRNOS = frozenset(
+    (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.EBADF)
+)
+
+# Default rsync options, pre-split; MaestroConfig.rsync_options_parsed overrides them
+DEFAULT_RSYNC_OPTIONS = ("-a", "-m", "--exclude=.keep")
 
 
 class FileManager:
     """Manages file operations and synchronization."""
     
-    def __init__(self, dry_run: bool = True):
+    def __init__(self, dry_run: bool = True, rsync_options: Sequence[str] = DEFAULT_RSYNC_OPTIONS):
         self.dry_run = dry_run
+        self.rsync_options = tuple(rsync_options)
         self.rsync_path = self._find_rsync()
     
-    def _find_rsync(self) -> Optional[str]:
-        """Find rsync executable."""
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _find_rsync() -> Optional[str]:
+        """Find rsync executable (looked up once per process)."""
         rsync_path = shutil.which("rsync")
         if not rsync_path:
             log_warning("rsync executable not found, falling back to Python copy")
@@ -27,10 +47,14 @@ class FileManager:
         self,
         source: Path,
         destination: Path,
-        options: str = "-a -m --exclude=.keep",
+        options: Optional[Union[str, Sequence[str]]] = None,
         recursive: bool = True
     ) -> bool:
-        """Synchronize directories using rsync or Python fallback."""
+        """Synchronize directories using rsync or Python fallback.
+        
+        ``options`` defaults to the manager's rsync options; a string is
+        split on whitespace.
+        """
         
         if not source.exists():
             log_warning(f"Source directory does not exist: {source}")
@@ -43,20 +67,28 @@ class FileManager:
         else:
             return self._python_sync(source, destination, recursive)
     
-    def _rsync_sync(self, source: Path, destination: Path, options: str) -> bool:
+    def _rsync_sync(
+        self,
+        source: Path,
+        destination: Path,
+        options: Optional[Union[str, Sequence[str]]] = None
+    ) -> bool:
         """Synchronize using rsync."""
         if not self.rsync_path:
             return False
         
-        # Parse rsync options
-        option_list = options.split()
+        # Only split when given a raw option string
+        if options is None:
+            options = self.rsync_options
+        elif isinstance(options, str):
+            options = options.split()
         
         # Ensure source ends with / for rsync
         source_str = str(source)
         if not source_str.endswith("/"):
             source_str += "/"
         
-        cmd = [self.rsync_path] + option_list + [source_str, str(destination)]
+        cmd = [self.rsync_path, *options, source_str, str(destination)]
         
         log_info(f"Syncing {source} to {destination} using rsync")
         
@@ -64,18 +96,63 @@ class FileManager:
             log_info(f"DRY RUN: Would execute: {' '.join(cmd)}")
             return True
         
+        returncode, stderr = run_keeping_stderr_tail(cmd)
+        if returncode != 0:
+            log_warning(f"rsync failed: {stderr}")
+            return False
+        
+        log_info(f"Successfully synced {source} to {destination}")
+        return True
+    
+    @staticmethod
+    def _copy_file(src: str, dst: str) -> None:
+        """Copy a file's data and metadata, keeping the data in the kernel.
+        
+        Tries copy_file_range, then sendfile, then a buffered userspace copy.
+        """
+        src_fd = os.open(src, os.O_RDONLY)
         try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            log_info(f"Successfully synced {source} to {destination}")
-            return True
-        except subprocess.CalledProcessError as e:
-            log_warning(f"rsync failed: {e.stderr}")
+            st = os.fstat(src_fd)
+            dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            try:
+                remaining = st.st_size
+                for copy in (_copy_file_range, _sendfile):
+                    if copy is None:
+                        continue
+                    try:
+                        while remaining > 0:
+                            sent = copy(src_fd, dst_fd, remaining)
+                            if sent == 0:
+                                break
+                            remaining -= sent
+                        break
+                    except OSError as e:
+                        # Unsupported for this pair of files; try the next method
+                        if e.errno not in _COPY_FALLBACK_ERRNOS:
+                            raise
+                
+                # Whatever is left (or a file that grew) goes through userspace
+                with open(src_fd, "rb", closefd=False) as fsrc, \
+                        open(dst_fd, "wb", closefd=False) as fdst:
+                    shutil.copyfileobj(fsrc, fdst, 1024 * 1024)
+                
+                os.fchmod(dst_fd, st.st_mode & 0o7777)
+            finally:
+                os.close(dst_fd)
+        finally:
+            os.close(src_fd)
+        os.utime(dst, ns=(st.st_atime_ns, st.st_mtime_ns))
+    
+    @staticmethod
+    def _is_up_to_date(entry: os.DirEntry, dest_path: str) -> bool:
+        """rsync's quick check: same size and modification time means no copy."""
+        try:
+            dest_st = os.stat(dest_path)
+        except OSError:
             return False
+        src_st = entry.stat()
+        return (src_st.st_size == dest_st.st_size
+                and src_st.st_mtime_ns == dest_st.st_mtime_ns)
     
     def _python_sync(self, source: Path, destination: Path, recursive: bool) -> bool:
         """Synchronize using Python's shutil (fallback)."""
@@ -87,21 +164,41 @@ class FileManager:
         
         try:
             if source.is_file():
-                shutil.copy2(source, destination)
+                if destination.is_dir():
+                    destination = destination / source.name
+                self._copy_file(str(source), str(destination))
             elif source.is_dir() and recursive:
-                # Copy directory contents
-                for item in source.rglob("*") if recursive else source.iterdir():
-                    if item.name.startswith('.') and item.name in ['.git', '.keep']:
-                        continue
-                    
-                    rel_path = item.relative_to(source)
-                    dest_path = destination / rel_path
-                    
-                    if item.is_file():
-                        dest_path.parent.mkdir(parents=True, exist_ok=True)
-                        shutil.copy2(item, dest_path)
-                    elif item.is_dir():
-                        dest_path.mkdir(parents=True, exist_ok=True)
+                # Walk the tree with an iterative scandir walk, which gets entry
+                # types from the directory listing without extra stats; create
+                # directories as we go and collect the files to copy
+                copies = []
+                pending = [(str(source), str(destination))]
+                while pending:
+                    source_dir, dest_dir = pending.pop()
+                    with os.scandir(source_dir) as entries:
+                        for entry in entries:
+                            if entry.name in ('.git', '.keep'):
+                                continue
+                            
+                            dest_path = os.path.join(dest_dir, entry.name)
+                            
+                            if entry.is_dir():
+                                os.makedirs(dest_path, exist_ok=True)
+                                if not entry.is_symlink():
+                                    pending.append((entry.path, dest_path))
+                            elif entry.is_file() and not self._is_up_to_date(entry, dest_path):
+                                copies.append((entry.path, dest_path))
+                
+                # Per-file copies are I/O-bound, so overlap them on a thread pool
+                if copies:
+                    workers = min(32, (os.cpu_count() or 1) * 4, len(copies))
+                    with ThreadPoolExecutor(max_workers=workers) as executor:
+                        futures = [
+                            executor.submit(self._copy_file, src, dst)
+                            for src, dst in copies
+                        ]
+                        for future in as_completed(futures):
+                            future.result()
             
             log_info(f"Successfully synced {source} to {destination}")
             return True
@@ -115,87 +212,132 @@ class FileManager:
         
         log_info(f"Merging {len(source_dirs)} directories into {target_dir}")
         
-        success = True
+        existing = [source_dir for source_dir in source_dirs if source_dir.exists()]
         for source_dir in source_dirs:
-            if source_dir.exists():
-                result = self.sync_directories(source_dir, target_dir)
-                success = success and result
-            else:
+            if source_dir not in existing:
                 log_warning(f"Source directory does not exist: {source_dir}")
         
+        if self.rsync_path and len(existing) > 1:
+            # rsync keeps the first of several same-named files, so pass the
+            # sources in reverse to keep "later sources win" semantics
+            sources = [f"{source_dir}/" for source_dir in reversed(existing)]
+            if sum(len(source) + 1 for source in sources) < self._arg_max():
+                return self._rsync_merge(sources, target_dir)
+        
+        success = True
+        for source_dir in existing:
+            result = self.sync_directories(source_dir, target_dir)
+            success = success and result
+        
         return success
     
-    def backup_file(self, file_path: Path, backup_suffix: str = ".backup") -> bool:
-        """Create a backup of a file."""
-        if not file_path.exists():
-            log_warning(f"Cannot backup non-existent file: {file_path}")
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _arg_max() -> int:
+        """Get a safe upper bound for the length of a command line."""
+        try:
+            arg_max = os.sysconf("SC_ARG_MAX")
+        except (AttributeError, ValueError, OSError):
+            arg_max = -1
+        # Leave room for the environment and the rest of the command line
+        return arg_max // 2 if arg_max > 0 else 32768
+    
+    def _rsync_merge(self, sources: List[str], target_dir: Path) -> bool:
+        """Merge several sources into target_dir with a single rsync run."""
+        cmd = [self.rsync_path, *self.rsync_options, *sources, str(target_dir)]
+        
+        log_info(f"Syncing {len(sources)} directories to {target_dir} using rsync")
+        
+        if self.dry_run:
+            log_info(f"DRY RUN: Would execute: {' '.join(cmd)}")
+            return True
+        
+        returncode, stderr = run_keeping_stderr_tail(cmd)
+        if returncode != 0:
+            log_warning(f"rsync failed: {stderr}")
             return False
         
+        log_info(f"Successfully synced {len(sources)} directories to {target_dir}")
+        return True
+    
+    def backup_file(self, file_path: Path, backup_suffix: str = ".backup") -> bool:
+        """Create a backup of a file."""
         backup_path = file_path.with_suffix(file_path.suffix + backup_suffix)
         
-        log_info(f"Creating backup: {file_path} -> {backup_path}")
-        
         if self.dry_run:
+            if not file_path.exists():
+                log_warning(f"Cannot backup non-existent file: {file_path}")
+                return False
+            log_info(f"Creating backup: {file_path} -> {backup_path}")
             log_info(f"DRY RUN: Would create backup {backup_path}")
             return True
         
+        # Let the copy itself report a missing source instead of stat'ing first
         try:
             shutil.copy2(file_path, backup_path)
-            return True
+        except FileNotFoundError:
+            log_warning(f"Cannot backup non-existent file: {file_path}")
+            return False
         except Exception as e:
             log_warning(f"Failed to create backup: {e}")
             return False
+        
+        log_info(f"Created backup: {file_path} -> {backup_path}")
+        return True
     
     def ensure_directory(self, dir_path: Path) -> bool:
         """Ensure directory exists."""
-        if dir_path.exists():
-            return True
-        
-        log_info(f"Creating directory: {dir_path}")
-        
         if self.dry_run:
-            log_info(f"DRY RUN: Would create directory {dir_path}")
+            if not dir_path.exists():
+                log_info(f"Creating directory: {dir_path}")
+                log_info(f"DRY RUN: Would create directory {dir_path}")
             return True
         
         try:
-            dir_path.mkdir(parents=True, exist_ok=True)
+            dir_path.mkdir(parents=True)
+        except FileExistsError:
             return True
         except Exception as e:
             log_warning(f"Failed to create directory {dir_path}: {e}")
             return False
+        
+        log_info(f"Created directory: {dir_path}")
+        return True
     
     def remove_file(self, file_path: Path) -> bool:
         """Remove a file."""
-        if not file_path.exists():
-            return True
-        
-        log_info(f"Removing file: {file_path}")
-        
         if self.dry_run:
-            log_info(f"DRY RUN: Would remove file {file_path}")
+            if file_path.exists():
+                log_info(f"Removing file: {file_path}")
+                log_info(f"DRY RUN: Would remove file {file_path}")
             return True
         
         try:
             file_path.unlink()
+        except FileNotFoundError:
             return True
         except Exception as e:
             log_warning(f"Failed to remove file {file_path}: {e}")
             return False
+        
+        log_info(f"Removed file: {file_path}")
+        return True
     
     def remove_directory(self, dir_path: Path) -> bool:
         """Remove a directory and its contents."""
-        if not dir_path.exists():
-            return True
-        
-        log_info(f"Removing directory: {dir_path}")
-        
         if self.dry_run:
-            log_info(f"DRY RUN: Would remove directory {dir_path}")
+            if dir_path.exists():
+                log_info(f"Removing directory: {dir_path}")
+                log_info(f"DRY RUN: Would remove directory {dir_path}")
             return True
         
         try:
             shutil.rmtree(dir_path)
+        except FileNotFoundError:
             return True
         except Exception as e:
             log_warning(f"Failed to remove directory {dir_path}: {e}")
             return False
+        
+        log_info(f"Removed directory: {dir_path}")
+        return True
@@ -2,36 +2,86 @@
 Git operations for Pyestro.
 """
 
+import os
 import subprocess
 import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 from ..core.config import RepositoryConfig, log_info, log_warning
 
 
 class GitManager:
     """Manages Git operations for repositories."""
     
-    def __init__(self, dry_run: bool = True):
+    def __init__(
+        self,
+        dry_run: bool = True,
+        max_workers: Optional[int] = None,
+        pull_ttl: float = 300
+    ):
         self.dry_run = dry_run
+        # Existing clones pulled less than pull_ttl seconds ago are not pulled again
+        self.pull_ttl = pull_ttl
         self.git_path = self._find_git()
+        # Clones and pulls are network-bound; bound the pool to avoid
+        # hammering a single remote with too many connections
+        self.max_workers = max_workers or max(1, (os.cpu_count() or 4) * 3 // 4)
     
-    def _find_git(self) -> Optional[str]:
-        """Find git executable."""
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _find_git() -> Optional[str]:
+        """Find git executable (looked up once per process)."""
         git_path = shutil.which("git")
         if not git_path:
             log_warning("Git executable not found in PATH")
         return git_path
     
+    @staticmethod
+    def _is_git_repo(repo_dir: Path) -> bool:
+        """Check for a .git entry with a single stat; it may be a file for worktrees."""
+        try:
+            os.stat(os.path.join(repo_dir, ".git"))
+            return True
+        except OSError:
+            return False
+    
+    @staticmethod
+    def _pull_marker(repo_dir: Path) -> Path:
+        """Get the file whose mtime records the last successful pull."""
+        return repo_dir / ".git" / "pyestro-last-pull"
+    
+    def _pulled_recently(self, repo_dir: Path) -> bool:
+        """Check whether the repository was pulled within pull_ttl seconds."""
+        if self.pull_ttl <= 0:
+            return False
+        try:
+            pulled_at = self._pull_marker(repo_dir).stat().st_mtime
+        except OSError:
+            return False
+        return time.time() - pulled_at < self.pull_ttl
+    
+    def _mark_pulled(self, repo_dir: Path) -> None:
+        """Record a successful pull; .git may be a file for worktrees, so ignore errors."""
+        try:
+            self._pull_marker(repo_dir).touch()
+        except OSError:
+            pass
+    
     def clone_repository(self, repo_config: RepositoryConfig, target_dir: Path) -> bool:
         """Clone a Git repository."""
         if not self.git_path:
             log_warning(f"Cannot clone {repo_config.name}: Git not available")
             return False
         
-        if target_dir.exists() and (target_dir / ".git").exists():
+        if self._is_git_repo(target_dir):
+            if self._pulled_recently(target_dir):
+                log_info(f"Repository {repo_config.name} was updated recently, skipping pull")
+                return True
             log_info(f"Repository {repo_config.name} already exists, pulling updates")
-            return self.pull_repository(target_dir)
+            return self.pull_repository(target_dir, is_repo=True)
         
         target_dir.mkdir(parents=True, exist_ok=True)
         
@@ -45,6 +95,14 @@ class GitManager:
         if repo_config.branch != "main":
             cmd.extend(["--branch", repo_config.branch])
         
+        # Transfer only what is needed to read the working tree
+        if repo_config.shallow:
+            cmd.extend(["--depth=1", "--single-branch"])
+        if repo_config.blobless:
+            cmd.append("--filter=blob:none")
+        if repo_config.submodule_jobs:
+            cmd.extend(["--recurse-submodules", "--jobs", str(repo_config.submodule_jobs)])
+        
         log_info(f"Cloning repository {repo_config.name} from {repo_config.url}")
         
         if self.dry_run:
@@ -64,13 +122,16 @@ class GitManager:
             log_warning(f"Failed to clone {repo_config.name}: {e.stderr}")
             return False
     
-    def pull_repository(self, repo_dir: Path) -> bool:
-        """Pull updates for an existing repository."""
+    def pull_repository(self, repo_dir: Path, is_repo: bool = False) -> bool:
+        """Pull updates for an existing repository.
+        
+        ``is_repo`` skips the .git check when the caller has already done it.
+        """
         if not self.git_path:
             log_warning(f"Cannot pull {repo_dir}: Git not available")
             return False
         
-        if not (repo_dir / ".git").exists():
+        if not is_repo and not self._is_git_repo(repo_dir):
             log_warning(f"Directory {repo_dir} is not a Git repository")
             return False
         
@@ -90,6 +151,7 @@ class GitManager:
                 check=True
             )
             log_info(f"Successfully pulled updates for {repo_dir}")
+            self._mark_pulled(repo_dir)
             return True
         except subprocess.CalledProcessError as e:
             log_warning(f"Failed to pull updates for {repo_dir}: {e.stderr}")
@@ -97,56 +159,77 @@ class GitManager:
     
     def get_repository_status(self, repo_dir: Path) -> Optional[dict]:
         """Get status information for a repository."""
-        if not self.git_path or not (repo_dir / ".git").exists():
+        # Without the check git would report on an enclosing repository
+        if not self.git_path or not self._is_git_repo(repo_dir):
             return None
         
         try:
-            # Get current branch
-            branch_result = subprocess.run(
-                [self.git_path, "-C", str(repo_dir), "rev-parse", "--abbrev-ref", "HEAD"],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            branch = branch_result.stdout.strip()
-            
-            # Get last commit hash
-            commit_result = subprocess.run(
-                [self.git_path, "-C", str(repo_dir), "rev-parse", "HEAD"],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            commit_hash = commit_result.stdout.strip()[:8]
-            
-            # Check if there are uncommitted changes
-            status_result = subprocess.run(
-                [self.git_path, "-C", str(repo_dir), "status", "--porcelain"],
+            # One porcelain v2 call reports the branch, HEAD and dirty state
+            result = subprocess.run(
+                [self.git_path, "-C", str(repo_dir), "status", "--porcelain=v2", "--branch"],
                 capture_output=True,
                 text=True,
                 check=True
             )
-            has_changes = bool(status_result.stdout.strip())
-            
-            return {
-                "branch": branch,
-                "commit": commit_hash,
-                "has_changes": has_changes,
-                "path": str(repo_dir)
-            }
         except subprocess.CalledProcessError:
             return None
+        
+        branch = commit_hash = None
+        has_changes = False
+        for line in result.stdout.splitlines():
+            if line.startswith("# branch.head "):
+                branch = line[len("# branch.head "):]
+            elif line.startswith("# branch.oid "):
+                commit_hash = line[len("# branch.oid "):]
+            elif not line.startswith("#"):
+                has_changes = True
+                break
+        
+        # No commits yet; rev-parse HEAD used to fail here as well
+        if not commit_hash or commit_hash == "(initial)":
+            return None
+        
+        return {
+            "branch": "HEAD" if branch == "(detached)" else branch,
+            "commit": commit_hash[:8],
+            "has_changes": has_changes,
+            "path": str(repo_dir)
+        }
+    
+    def get_repositories_status(self, repo_dirs: List[Path]) -> Dict[Path, Optional[dict]]:
+        """Get status information for multiple repositories concurrently."""
+        if not repo_dirs:
+            return {}
+        
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(repo_dirs))) as executor:
+            return dict(zip(repo_dirs, executor.map(self.get_repository_status, repo_dirs)))
     
     def clone_repositories(self, repo_configs: List[RepositoryConfig], base_dir: Path) -> dict:
-        """Clone multiple repositories."""
+        """Clone multiple repositories concurrently."""
         results = {}
+        if not repo_configs:
+            return results
         
-        for repo_config in repo_configs:
-            target_dir = base_dir / repo_config.name
-            success = self.clone_repository(repo_config, target_dir)
-            results[repo_config.name] = {
-                "success": success,
-                "path": target_dir
-            }
+        # Clones are network-bound and independent, so overlap them
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(repo_configs))) as executor:
+            futures = [
+                (repo_config, base_dir / repo_config.name,
+                 executor.submit(self.clone_repository, repo_config, base_dir / repo_config.name))
+                for repo_config in repo_configs
+            ]
+            
+            for repo_config, target_dir, future in futures:
+                results[repo_config.name] = {
+                    "success": future.result(),
+                    "path": target_dir
+                }
         
         return results
+    
+    def pull_repositories(self, repo_dirs: List[Path]) -> Dict[Path, bool]:
+        """Pull multiple repositories concurrently, keeping the input order."""
+        if not repo_dirs:
+            return {}
+        
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(repo_dirs))) as executor:
+            return dict(zip(repo_dirs, executor.map(self.pull_repository, repo_dirs)))
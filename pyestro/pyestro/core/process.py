@@ -0,0 +1,75 @@
+"""
+Subprocess helpers for Pyestro.
+"""
+
+import json
+import subprocess
+import tempfile
+from collections import deque
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def run_keeping_stderr_tail(cmd: List[str], max_lines: int = 1000) -> Tuple[int, str]:
+    """Run a command, discarding stdout and keeping only the end of stderr.
+
+    Unlike ``capture_output=True`` this never buffers a whole run's output,
+    so long or verbose commands cannot grow memory without bound.
+    """
+    with subprocess.Popen(
+        cmd,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        bufsize=1
+    ) as process:
+        tail = deque(process.stderr, maxlen=max_lines)
+    return process.returncode, "".join(tail)
+
+
+def iter_output_lines(cmd: List[str], env: Optional[Dict[str, str]] = None,
+                      check: bool = False) -> Iterator[str]:
+    """Run a command and yield its stdout line by line as it is produced.
+
+    stderr is spooled to a temporary file rather than a pipe, so a chatty
+    stderr cannot block the child while stdout is being consumed. With
+    ``check=True`` a non-zero exit raises CalledProcessError (with decoded
+    stderr) once stdout is exhausted.
+    """
+    with tempfile.TemporaryFile() as stderr:
+        with subprocess.Popen(
+            cmd,
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=stderr,
+            text=True
+        ) as process:
+            yield from process.stdout
+        if check and process.returncode != 0:
+            stderr.seek(0)
+            raise subprocess.CalledProcessError(
+                process.returncode, cmd, None,
+                stderr.read().decode("utf-8", errors="replace")
+            )
+
+
+def run_json(cmd: List[str]) -> Any:
+    """Run a command and parse its stdout as JSON.
+
+    The output is parsed straight from bytes, with orjson when available, so
+    large documents are never decoded into an intermediate ``str``. Raises
+    CalledProcessError (with decoded stderr) on failure and JSONDecodeError
+    on invalid output.
+    """
+    result = subprocess.run(cmd, capture_output=True)
+    if result.returncode != 0:
+        raise subprocess.CalledProcessError(
+            result.returncode, cmd, result.stdout,
+            result.stderr.decode("utf-8", errors="replace")
+        )
+    return orjson.loads(result.stdout) if HAS_ORJSON else json.loads(result.stdout)
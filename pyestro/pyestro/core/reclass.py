@@ -3,11 +3,16 @@ Reclass integration for Pyestro.
 """
 
 import json
+import os
 import subprocess
+import time
 import shutil
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from ..core.config import log_info, log_warning
+from ..core.process import run_json
 from ..core.validation import InputValidator
 
 
@@ -18,14 +23,53 @@ class ReclassParser:
         self.inventory_dir = inventory_dir
         self.dry_run = dry_run
         self.reclass_path = self._find_reclass()
+        # Rendered nodes from the last full inventory run, reused by lookups
+        self._inventory: Optional[Dict[str, Dict[str, Any]]] = None
+        self._inventory_key: Optional[Tuple[int, int]] = None
+        # Fingerprint at which the full render last failed, so it isn't retried
+        # until the inventory changes
+        self._inventory_failed_key: Optional[Tuple[int, int]] = None
+        # Single-node results, keyed by node name and inventory fingerprint
+        self._node_cache: Dict[Tuple[str, Tuple[int, int]], Dict[str, Any]] = {}
+        self._fingerprint: Optional[Tuple[int, int]] = None
+        self._fingerprint_time = 0.0
     
-    def _find_reclass(self) -> Optional[str]:
-        """Find reclass executable."""
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _find_reclass() -> Optional[str]:
+        """Find reclass executable (looked up once per process)."""
         reclass_path = shutil.which("reclass")
         if not reclass_path:
             log_warning("reclass executable not found, some functionality will be limited")
         return reclass_path
     
+    def _inventory_fingerprint(self) -> Tuple[int, int]:
+        """Get (file count, newest mtime) of the nodes and classes trees.
+        
+        The walk is repeated at most once a second.
+        """
+        now = time.monotonic()
+        if self._fingerprint is not None and now - self._fingerprint_time < 1.0:
+            return self._fingerprint
+        
+        count = 0
+        newest = 0
+        pending = [str(self.inventory_dir / "nodes"), str(self.inventory_dir / "classes")]
+        while pending:
+            try:
+                with os.scandir(pending.pop()) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                        count += 1
+                        newest = max(newest, entry.stat().st_mtime_ns)
+            except OSError:
+                continue
+        
+        self._fingerprint = (count, newest)
+        self._fingerprint_time = now
+        return self._fingerprint
+    
     def get_node_data(self, node_name: str) -> Optional[Dict[str, Any]]:
         """Get node data from reclass."""
         if not self.reclass_path:
@@ -39,11 +83,19 @@ class ReclassParser:
             log_warning(f"Invalid node name: {e}")
             return None
         
+        # Reuse the full inventory or an earlier lookup if nothing changed
+        fingerprint = self._inventory_fingerprint()
+        if self._inventory_key == fingerprint and node_name in self._inventory:
+            return self._inventory[node_name]
+        cache_key = (node_name, fingerprint)
+        if cache_key in self._node_cache:
+            return self._node_cache[cache_key]
+        
         cmd = [
             self.reclass_path,
             '-b', str(self.inventory_dir),
             '-n', node_name,
-            '--output-format', 'json'
+            '--output', 'json'
         ]
         
         log_info(f"Getting node data for: {node_name}")
@@ -53,13 +105,9 @@ class ReclassParser:
             return {"parameters": {}, "classes": [], "applications": []}
         
         try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            return json.loads(result.stdout)
+            node_data = run_json(cmd)
+            self._node_cache[cache_key] = node_data
+            return node_data
         except subprocess.CalledProcessError as e:
             log_warning(f"reclass failed for node {node_name}: {e.stderr}")
             return None
@@ -67,57 +115,78 @@ class ReclassParser:
             log_warning(f"Failed to parse reclass output for node {node_name}: {e}")
             return None
     
-    def list_nodes(self) -> List[str]:
-        """List all available nodes."""
-        if not self.reclass_path:
-            # Fallback: scan inventory directory
-            return self._scan_nodes_from_filesystem()
+    def get_full_inventory(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Render all nodes with a single reclass run.
+        
+        Returns a mapping of node name to its parameters, classes and
+        applications, or None if reclass is unavailable or fails. The result
+        is reused until files in the inventory change.
+        """
+        fingerprint = self._inventory_fingerprint()
+        if self._inventory_key == fingerprint:
+            return self._inventory
+        
+        if not self.reclass_path or self._inventory_failed_key == fingerprint:
+            return None
         
         cmd = [
             self.reclass_path,
             '-b', str(self.inventory_dir),
-            '--inventory'
+            '--inventory',
+            '--output', 'json'
         ]
         
-        log_info("Listing available nodes")
+        log_info("Rendering reclass inventory")
         
         if self.dry_run:
             log_info(f"DRY RUN: Would execute: {' '.join(cmd)}")
-            return ["example-node1", "example-node2"]
+            return None
         
         try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            
-            # Parse reclass inventory output
-            inventory = json.loads(result.stdout)
-            nodes = list(inventory.get('nodes', {}).keys())
-            return sorted(nodes)
+            self._inventory = run_json(cmd).get('nodes', {})
+            self._inventory_key = fingerprint
+            return self._inventory
         except subprocess.CalledProcessError as e:
             log_warning(f"reclass inventory failed: {e.stderr}")
-            return self._scan_nodes_from_filesystem()
         except json.JSONDecodeError as e:
             log_warning(f"Failed to parse reclass inventory: {e}")
+        self._inventory_failed_key = fingerprint
+        return None
+    
+    def list_nodes(self) -> List[str]:
+        """List all available nodes."""
+        if not self.reclass_path:
+            # Fallback: scan inventory directory
             return self._scan_nodes_from_filesystem()
+        
+        log_info("Listing available nodes")
+        
+        if self.dry_run:
+            log_info(f"DRY RUN: Would execute: {self.reclass_path} -b {self.inventory_dir} --inventory")
+            return ["example-node1", "example-node2"]
+        
+        inventory = self.get_full_inventory()
+        if inventory is None:
+            return self._scan_nodes_from_filesystem()
+        return sorted(inventory)
     
     def _scan_nodes_from_filesystem(self) -> List[str]:
         """Scan nodes directory for node files."""
-        nodes_dir = self.inventory_dir / "nodes"
-        if not nodes_dir.exists():
-            return []
+        nodes_dir = str(self.inventory_dir / "nodes")
+        prefix_len = len(nodes_dir) + 1
         
+        # Work on plain strings; building Path objects per file dominates on
+        # large inventories
         nodes = []
-        for node_file in nodes_dir.rglob("*.yml"):
-            # Convert path to node name
-            rel_path = node_file.relative_to(nodes_dir)
-            node_name = str(rel_path.with_suffix(''))
-            nodes.append(node_name.replace('/', '.'))
+        for root, _, files in os.walk(nodes_dir):
+            for filename in files:
+                if filename.endswith(".yml"):
+                    # Convert path to node name
+                    rel_path = os.path.join(root, filename[:-4])[prefix_len:]
+                    nodes.append(rel_path.replace(os.sep, '.'))
         
-        return sorted(nodes)
+        nodes.sort()
+        return nodes
     
     def get_node_parameters(self, node_name: str) -> Dict[str, Any]:
         """Get parameters for a specific node."""
@@ -135,11 +204,21 @@ class ReclassParser:
     
     def search_parameter(self, parameter_name: str) -> Dict[str, Any]:
         """Search for a parameter across all nodes."""
-        nodes = self.list_nodes()
-        results = {}
+        inventory = self.get_full_inventory()
+        if inventory is None:
+            # Fall back to per-node lookups; each one waits on a reclass
+            # process, so overlap them on a thread pool
+            nodes = self.list_nodes()
+            inventory = {}
+            if nodes:
+                workers = min(32, (os.cpu_count() or 4) * 2, len(nodes))
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    for node, node_data in zip(nodes, executor.map(self.get_node_data, nodes)):
+                        inventory[node] = node_data or {}
         
-        for node in nodes:
-            parameters = self.get_node_parameters(node)
+        results = {}
+        for node, node_data in sorted(inventory.items()):
+            parameters = node_data.get('parameters', {})
             if parameter_name in parameters:
                 results[node] = parameters[parameter_name]
         
@@ -177,21 +256,26 @@ class ReclassParser:
         
         log_info(f"Merging {len(source_dirs)} inventory directories into {target_dir}")
         
-        success = True
+        existing_dirs = []
         for source_dir in source_dirs:
-            if not source_dir.exists():
+            if source_dir.exists():
+                existing_dirs.append(source_dir)
+            else:
                 log_warning(f"Source inventory directory does not exist: {source_dir}")
-                continue
-            
-            # Copy nodes and classes
-            for subdir in ['nodes', 'classes']:
-                source_subdir = source_dir / subdir
-                target_subdir = target_dir / subdir
-                
-                if source_subdir.exists():
-                    from ..core.file_ops import FileManager
-                    file_manager = FileManager(self.dry_run)
-                    result = file_manager.sync_directories(source_subdir, target_subdir)
-                    success = success and result
+        
+        # Merge each subdirectory from all sources at once, so rsync runs once
+        # per subdirectory rather than once per source and subdirectory
+        from ..core.file_ops import FileManager
+        file_manager = FileManager(self.dry_run)
+        
+        success = True
+        for subdir in ['nodes', 'classes']:
+            source_subdirs = [
+                source_dir / subdir for source_dir in existing_dirs
+                if (source_dir / subdir).exists()
+            ]
+            if source_subdirs:
+                result = file_manager.merge_directories(source_subdirs, target_dir / subdir)
+                success = success and result
         
         return success
@@ -2,19 +2,32 @@
 Template engine for Pyestro project generation.
 """
 
+import importlib.util
 import json
+import os
+import re
 import shutil
+from functools import cached_property
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
+
+# jinja2 is only imported once a template is rendered, so listing templates
+# doesn't pay for it
+HAS_JINJA2 = importlib.util.find_spec("jinja2") is not None
+if TYPE_CHECKING:
+    from jinja2 import Environment, Template
 
 try:
-    from jinja2 import Environment, FileSystemLoader, Template
-    HAS_JINJA2 = True
+    import orjson
+    HAS_ORJSON = True
 except ImportError:
-    HAS_JINJA2 = False
+    HAS_ORJSON = False
 
 from .validation import InputValidator
 
+# Template files larger than this are rendered straight to disk
+STREAM_TEMPLATE_THRESHOLD = 64 * 1024
+
 
 class TemplateEngine:
     """Template engine for generating Pyestro projects."""
@@ -27,45 +40,97 @@ class TemplateEngine:
         
         self.templates_dir = Path(templates_dir)
         self.validator = InputValidator()
-        
-        # Initialize Jinja2 if available
-        if HAS_JINJA2:
-            self.jinja_env = Environment(
+        self._jinja_env: "Optional[Environment]" = None
+        # Compiled templates, keyed by source text or by (path, mtime)
+        self._template_cache: Dict[Any, "Template"] = {}
+        # Placeholder patterns for the plain-text fallback, keyed by variable names
+        self._placeholder_patterns: Dict[frozenset, "re.Pattern[str]"] = {}
+        # (templates_dir mtime, subdirectory mtimes, subdirectories, templates)
+        self._template_list_cache: Optional[
+            Tuple[int, Optional[Tuple[int, ...]], List[str], List[str]]
+        ] = None
+        self._info_cache: Dict[Path, Tuple[int, Dict[str, Any]]] = {}
+    
+    @property
+    def jinja_env(self) -> "Optional[Environment]":
+        """Get the Jinja2 environment, creating it on first use."""
+        if self._jinja_env is None and HAS_JINJA2:
+            from jinja2 import Environment, FileSystemLoader
+            self._jinja_env = Environment(
                 loader=FileSystemLoader(str(self.templates_dir)),
                 trim_blocks=True,
                 lstrip_blocks=True
             )
-        else:
-            self.jinja_env = None
+        return self._jinja_env
     
     def get_available_templates(self) -> List[str]:
         """Get list of available project templates."""
-        if not self.templates_dir.exists():
+        try:
+            mtime_ns = os.stat(self.templates_dir).st_mtime_ns
+        except FileNotFoundError:
             return []
         
+        # Adding or removing a template directory changes the parent's mtime,
+        # and adding or removing its template.json changes the directory's own
+        cached = self._template_list_cache
+        if cached and cached[0] == mtime_ns and cached[1] == self._dir_mtimes(cached[2]):
+            return list(cached[3])
+        
+        candidates = []
         templates = []
-        for item in self.templates_dir.iterdir():
-            if item.is_dir() and not item.name.startswith('.'):
-                # Check if it has a template.json metadata file
-                metadata_file = item / "template.json"
-                if metadata_file.exists():
-                    templates.append(item.name)
-        
-        return sorted(templates)
+        with os.scandir(self.templates_dir) as entries:
+            for entry in entries:
+                if entry.is_dir() and not entry.name.startswith('.'):
+                    # Record the mtime before the check so a template.json
+                    # added meanwhile still invalidates the list
+                    candidates.append((entry.name, entry.stat().st_mtime_ns))
+                    # Check if it has a template.json metadata file
+                    try:
+                        os.stat(os.path.join(entry.path, "template.json"))
+                    except FileNotFoundError:
+                        continue
+                    templates.append(entry.name)
+        
+        candidates.sort()
+        templates.sort()
+        self._template_list_cache = (
+            mtime_ns,
+            tuple(mtime for _, mtime in candidates),
+            [name for name, _ in candidates],
+            templates,
+        )
+        return list(templates)
+    
+    def _dir_mtimes(self, names: List[str]) -> Optional[Tuple[int, ...]]:
+        """Get the mtimes of the named template directories, or None if one is gone."""
+        try:
+            return tuple(os.stat(self.templates_dir / name).st_mtime_ns for name in names)
+        except OSError:
+            return None
     
     def get_template_info(self, template_name: str) -> Optional[Dict[str, Any]]:
         """Get template metadata information."""
         template_dir = self.templates_dir / template_name
         metadata_file = template_dir / "template.json"
         
-        if not metadata_file.exists():
+        try:
+            mtime_ns = metadata_file.stat().st_mtime_ns
+        except OSError:
             return None
         
+        # Each template.json is parsed once until it changes
+        cached = self._info_cache.get(metadata_file)
+        if cached and cached[0] == mtime_ns:
+            return dict(cached[1])
+        
         try:
-            with open(metadata_file, 'r') as f:
-                return json.load(f)
+            raw = metadata_file.read_bytes()
+            info = orjson.loads(raw) if HAS_ORJSON else json.loads(raw)
         except (json.JSONDecodeError, IOError):
             return None
+        
+        self._info_cache[metadata_file] = (mtime_ns, info)
+        return dict(info)
     
     def validate_project_name(self, name: str) -> bool:
         """Validate project name."""
@@ -87,26 +152,56 @@ class TemplateEngine:
     
     def render_template_content(self, content: str, variables: Dict[str, Any]) -> str:
         """Render template content with variables."""
+        # Most file names and many files contain no template syntax at all
+        if "{{" not in content and "{%" not in content and "{#" not in content:
+            if not HAS_JINJA2:
+                return content
+            if "\r" not in content:
+                # Jinja2 drops a single trailing newline; mirror that exactly
+                return content[:-1] if content.endswith("\n") else content
+        
         if not HAS_JINJA2:
-            # Simple variable substitution without Jinja2
-            for key, value in variables.items():
-                placeholder = f"{{{{{key}}}}}"
-                content = content.replace(placeholder, str(value))
-            return content
-        
-        # Use Jinja2 for advanced templating
-        template = Template(content)
-        return template.render(**variables)
+            # Simple {{name}} substitution without Jinja2, in a single pass
+            if not variables:
+                return content
+            names = frozenset(variables)
+            pattern = self._placeholder_patterns.get(names)
+            if pattern is None:
+                pattern = self._placeholder_patterns[names] = re.compile(
+                    r"\{\{(" + "|".join(map(re.escape, variables)) + r")\}\}"
+                )
+            return pattern.sub(lambda match: str(variables[match.group(1)]), content)
+        
+        # Use Jinja2 for advanced templating; compiling dominates the cost of
+        # small renders, so compile each distinct source only once
+        template = self._template_cache.get(content)
+        if template is None:
+            template = self._template_cache[content] = self.jinja_env.from_string(content)
+        return template.render(variables)
     
     def render_file_template(self, template_path: Path, variables: Dict[str, Any]) -> str:
         """Render a template file with variables."""
-        if not template_path.exists():
-            raise FileNotFoundError(f"Template file not found: {template_path}")
+        if not HAS_JINJA2:
+            if not template_path.exists():
+                raise FileNotFoundError(f"Template file not found: {template_path}")
+            with open(template_path, 'r', encoding='utf-8') as f:
+                return self.render_template_content(f.read(), variables)
         
-        with open(template_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        return self._compile_file_template(template_path).render(variables)
+    
+    def _compile_file_template(self, template_path: Path) -> "Template":
+        """Get the compiled Jinja2 template for a file, cached by path and mtime."""
+        try:
+            mtime_ns = template_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Template file not found: {template_path}")
         
-        return self.render_template_content(content, variables)
+        key = (str(template_path), mtime_ns)
+        template = self._template_cache.get(key)
+        if template is None:
+            with open(template_path, 'r', encoding='utf-8') as f:
+                template = self._template_cache[key] = self.jinja_env.from_string(f.read())
+        return template
     
     def create_project(self, template_name: str, project_name: str, 
                       target_dir: Path, variables: Optional[Dict[str, Any]] = None) -> bool:
@@ -149,41 +244,59 @@ class TemplateEngine:
     
     def _process_template_directory(self, template_dir: Path, target_dir: Path, 
                                    variables: Dict[str, Any]) -> None:
-        """Recursively process template directory."""
-        for item in template_dir.iterdir():
-            # Skip metadata and hidden files
-            if item.name in ('template.json', '.gitkeep') or item.name.startswith('.'):
-                continue
+        """Process a template directory tree into target_dir."""
+        # Walk with plain strings and map each source directory to its
+        # rendered target; Path objects are only built for the files
+        target_dirs = {str(template_dir): str(target_dir)}
+        for dirpath, dirnames, filenames in os.walk(template_dir, followlinks=True):
+            current_target = target_dirs[dirpath]
             
-            # Calculate target path
-            target_name = self.render_template_content(item.name, variables)
-            target_path = target_dir / target_name
+            # Skip metadata and hidden entries, and prune them from the walk
+            dirnames[:] = [
+                name for name in dirnames
+                if name not in ('template.json', '.gitkeep') and not name.startswith('.')
+            ]
+            for name in dirnames:
+                target_path = os.path.join(
+                    current_target, self.render_template_content(name, variables)
+                )
+                os.makedirs(target_path, exist_ok=True)
+                target_dirs[os.path.join(dirpath, name)] = target_path
             
-            if item.is_dir():
-                # Recursively process subdirectory
-                target_path.mkdir(parents=True, exist_ok=True)
-                self._process_template_directory(item, target_path, variables)
-            else:
-                # Process file
-                self._process_template_file(item, target_path, variables)
+            for name in filenames:
+                if name in ('template.json', '.gitkeep') or name.startswith('.'):
+                    continue
+                target_name = self.render_template_content(name, variables)
+                self._process_template_file(
+                    Path(dirpath, name), Path(current_target, target_name), variables
+                )
     
     def _process_template_file(self, template_file: Path, target_file: Path, 
                               variables: Dict[str, Any]) -> None:
         """Process a single template file."""
         if template_file.suffix in ('.j2', '.jinja', '.template'):
-            # Render template file
-            content = self.render_file_template(template_file, variables)
-            
             # Remove template extension from target filename
             if target_file.suffix in ('.j2', '.jinja', '.template'):
                 target_file = target_file.with_suffix('')
             
+            # Stream large templates to disk instead of building the output in memory
+            if HAS_JINJA2 and template_file.stat().st_size > STREAM_TEMPLATE_THRESHOLD:
+                template = self._compile_file_template(template_file)
+                with open(target_file, 'w', encoding='utf-8') as f:
+                    template.stream(variables).dump(f)
+                return
+            
+            # Render template file
+            content = self.render_file_template(template_file, variables)
+            
             # Write rendered content
             with open(target_file, 'w', encoding='utf-8') as f:
                 f.write(content)
         else:
-            # Copy binary/non-template file as-is
-            shutil.copy2(template_file, target_file)
+            # Copy binary/non-template file as-is; keep the mode so scripts stay
+            # executable, but skip timestamps and extended attributes
+            shutil.copyfile(template_file, target_file)
+            shutil.copymode(template_file, target_file)
 
 
 class ProjectGenerator:
@@ -193,8 +306,9 @@ class ProjectGenerator:
         """Initialize project generator."""
         self.template_engine = TemplateEngine(templates_dir)
     
-    def list_templates(self) -> List[Dict[str, Any]]:
-        """List available templates with their information."""
+    @cached_property
+    def templates(self) -> List[Dict[str, Any]]:
+        """Available templates with their information, scanned once."""
         templates = []
         for template_name in self.template_engine.get_available_templates():
             info = self.template_engine.get_template_info(template_name)
@@ -205,6 +319,10 @@ class ProjectGenerator:
                 })
         return templates
     
+    def list_templates(self) -> List[Dict[str, Any]]:
+        """List available templates with their information."""
+        return list(self.templates)
+    
     def create_project(self, template_name: str, project_name: str, 
                       target_dir: Optional[Path] = None, 
                       variables: Optional[Dict[str, Any]] = None,
@@ -2,11 +2,21 @@
 Input validation and sanitization for Pyestro.
 """
 
-import re
+import string
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, List, Optional
 from urllib.parse import urlparse
 
+# google-re2 matches in linear time with a DFA; none of the patterns below
+# use backreferences or lookaround, so it is a drop-in replacement
+try:
+    import re2 as re
+    HAS_RE2 = True
+except ImportError:
+    import re
+    HAS_RE2 = False
+
 
 class ValidationError(Exception):
     """Raised when validation fails."""
@@ -26,79 +36,129 @@ class InputValidator:
     
     # Shell command blacklist (dangerous characters)
     SHELL_BLACKLIST = re.compile(r'[;&|`$\(\)<>]')
+    SHELL_BAD_CHARS = frozenset(';&|`$()<>')
+    
+    # Well-formed repository URL prefixes that need no further parsing
+    URL_PREFIX_PATTERN = re.compile(r'(?i:https?|git)://[^/?#]|(?i:ssh)://|git@')
+    
+    # Filter patterns that are always valid
+    TRIVIAL_FILTERS = frozenset({'all', '*', 'ungrouped', 'localhost'})
+    
+    # Characters not allowed in a single path component
+    PATH_COMPONENT_BAD_CHARS = frozenset('<>:"|?*\0')
+    
+    # Reserved device names on Windows
+    WINDOWS_RESERVED_NAMES = frozenset({
+        'CON', 'PRN', 'AUX', 'NUL',
+        'COM1', 'COM2', 'COM3', 'COM4', 'COM5', 'COM6', 'COM7', 'COM8', 'COM9',
+        'LPT1', 'LPT2', 'LPT3', 'LPT4', 'LPT5', 'LPT6', 'LPT7', 'LPT8', 'LPT9'
+    })
+    
+    # Character-class checks as str.translate deletion tables: translating
+    # away the allowed characters leaves an empty string for valid input, and
+    # runs entirely in C without the regex engine
+    _ALNUM = string.ascii_letters + string.digits
+    NODE_NAME_DELETE = str.maketrans('', '', _ALNUM + '._-')
+    ANSIBLE_MODULE_DELETE = str.maketrans('', '', _ALNUM + '_.')
+    FILTER_DELETE = str.maketrans('', '', _ALNUM + '.*_-')
     
     @staticmethod
     def sanitize_hostname(hostname: str) -> str:
         """Validate and sanitize hostnames."""
-        if not hostname or not isinstance(hostname, str):
+        if not isinstance(hostname, str) or not hostname:
             raise ValidationError("Hostname must be a non-empty string")
         
         hostname = hostname.strip().lower()
         
+        error = InputValidator._hostname_error(hostname)
+        if error:
+            raise ValidationError(error)
+        
+        return hostname
+    
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _hostname_error(hostname: str) -> Optional[str]:
+        """Return why a normalized hostname is invalid, or None (memoized)."""
         if not InputValidator.HOSTNAME_PATTERN.match(hostname):
-            raise ValidationError(f"Invalid hostname format: {hostname}")
+            return f"Invalid hostname format: {hostname}"
         
         if len(hostname) > 253:
-            raise ValidationError(f"Hostname too long: {hostname}")
+            return f"Hostname too long: {hostname}"
         
-        return hostname
+        return None
     
     @staticmethod
     def sanitize_node_name(node_name: str) -> str:
         """Validate and sanitize node names."""
-        if not node_name or not isinstance(node_name, str):
+        if not isinstance(node_name, str) or not node_name:
             raise ValidationError("Node name must be a non-empty string")
         
         node_name = node_name.strip()
         
-        if not InputValidator.NODE_NAME_PATTERN.match(node_name):
-            raise ValidationError(f"Invalid node name format: {node_name}")
+        error = InputValidator._node_name_error(node_name)
+        if error:
+            raise ValidationError(error)
+        
+        return node_name
+    
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _node_name_error(node_name: str) -> Optional[str]:
+        """Return why a stripped node name is invalid, or None (memoized)."""
+        if not node_name or node_name.translate(InputValidator.NODE_NAME_DELETE):
+            return f"Invalid node name format: {node_name}"
         
         if len(node_name) > 100:
-            raise ValidationError(f"Node name too long: {node_name}")
+            return f"Node name too long: {node_name}"
         
-        return node_name
+        return None
     
     @staticmethod
     def validate_path(path: str, must_exist: bool = True) -> Path:
         """Validate file paths."""
-        if not path or not isinstance(path, str):
+        if not isinstance(path, str) or not path:
             raise ValidationError("Path must be a non-empty string")
         
         try:
-            p = Path(path).expanduser().resolve()
+            raw = Path(path)
+            p = raw.expanduser()
         except Exception as e:
             raise ValidationError(f"Invalid path format: {path} - {e}")
         
-        # Check for path traversal attempts
-        if '..' in Path(path).parts:
+        # Check for path traversal attempts (cheap substring test first)
+        if '..' in path and '..' in raw.parts:
             raise ValidationError(f"Path traversal not allowed: {path}")
         
-        if must_exist and not p.exists():
+        # Only pay for symlink resolution when the path has to exist anyway;
+        # otherwise make it absolute without touching the filesystem
+        if not must_exist:
+            return p.absolute()
+        
+        try:
+            p = p.resolve(strict=True)
+        except FileNotFoundError:
             raise ValidationError(f"Path does not exist: {path}")
+        except (OSError, RuntimeError) as e:
+            raise ValidationError(f"Invalid path format: {path} - {e}")
         
         return p
     
     @staticmethod
     def validate_path_component(component: str) -> bool:
         """Validate a single path component (filename/directory name)."""
-        if not component or not isinstance(component, str):
+        if not isinstance(component, str) or not component:
             return False
         
         component = component.strip()
         
         # Check for invalid characters
-        invalid_chars = '<>:"|?*\0'
-        if any(char in component for char in invalid_chars):
+        if not InputValidator.PATH_COMPONENT_BAD_CHARS.isdisjoint(component):
             return False
         
-        # Check for reserved names on Windows
-        reserved_names = {
-            'CON', 'PRN', 'AUX', 'NUL',
-            'COM1', 'COM2', 'COM3', 'COM4', 'COM5', 'COM6', 'COM7', 'COM8', 'COM9',
-            'LPT1', 'LPT2', 'LPT3', 'LPT4', 'LPT5', 'LPT6', 'LPT7', 'LPT8', 'LPT9'
-        }
-        if component.upper() in reserved_names:
+        # Check for reserved names on Windows (only upper-case plausible ones)
+        if (len(component) <= 4 and component[:1] in 'CPANLcpanl'
+                and component.upper() in InputValidator.WINDOWS_RESERVED_NAMES):
             return False
         
         # Check for path traversal
@@ -114,27 +174,43 @@ class InputValidator:
     @staticmethod
     def validate_url(url: str) -> str:
         """Validate URLs."""
-        if not url or not isinstance(url, str):
+        if not isinstance(url, str) or not url:
             raise ValidationError("URL must be a non-empty string")
         
         url = url.strip()
         
+        error = InputValidator._url_error(url)
+        if error:
+            raise ValidationError(error)
+        
+        return url
+    
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _url_error(url: str) -> Optional[str]:
+        """Return why a stripped URL is invalid, or None (memoized)."""
+        # Accept the common forms without urlparse; printable ASCII without
+        # brackets is exactly what urlparse would also accept after them
+        if (InputValidator.URL_PREFIX_PATTERN.match(url) and url.isascii()
+                and url.isprintable() and '[' not in url and ']' not in url):
+            return None
+        
         # Parse URL
         try:
             parsed = urlparse(url)
         except Exception as e:
-            raise ValidationError(f"Invalid URL format: {url} - {e}")
+            return f"Invalid URL format: {url} - {e}"
         
         # Check scheme
         allowed_schemes = {'http', 'https', 'git', 'ssh'}
         if parsed.scheme not in allowed_schemes and not url.startswith('git@'):
-            raise ValidationError(f"Unsupported URL scheme: {parsed.scheme}")
+            return f"Unsupported URL scheme: {parsed.scheme}"
         
         # Basic hostname validation for non-SSH URLs
         if parsed.scheme in {'http', 'https', 'git'} and not parsed.netloc:
-            raise ValidationError(f"URL missing hostname: {url}")
+            return f"URL missing hostname: {url}"
         
-        return url
+        return None
     
     @staticmethod
     def sanitize_shell_input(input_str: str) -> str:
@@ -142,7 +218,7 @@ class InputValidator:
         if not isinstance(input_str, str):
             raise ValidationError("Input must be a string")
         
-        if InputValidator.SHELL_BLACKLIST.search(input_str):
+        if not InputValidator.SHELL_BAD_CHARS.isdisjoint(input_str):
             raise ValidationError(f"Input contains dangerous characters: {input_str}")
         
         return input_str.strip()
@@ -150,13 +226,13 @@ class InputValidator:
     @staticmethod
     def validate_ansible_module_name(module_name: str) -> str:
         """Validate Ansible module names."""
-        if not module_name or not isinstance(module_name, str):
+        if not isinstance(module_name, str) or not module_name:
             raise ValidationError("Module name must be a non-empty string")
         
         module_name = module_name.strip()
         
         # Ansible module names can contain letters, numbers, underscores, and dots
-        if not re.match(r'^[a-zA-Z0-9_.]+$', module_name):
+        if not module_name or module_name.translate(InputValidator.ANSIBLE_MODULE_DELETE):
             raise ValidationError(f"Invalid Ansible module name: {module_name}")
         
         return module_name
@@ -169,11 +245,15 @@ class InputValidator:
         
         pattern = pattern.strip()
         
+        # Fast path for "all" and plain host names, the usual arguments
+        if pattern in InputValidator.TRIVIAL_FILTERS or (pattern.isascii() and pattern.isalnum()):
+            return pattern
+        
         if not pattern:
             raise ValidationError("Filter pattern cannot be empty")
         
         # Allow alphanumeric, wildcards, dots, hyphens, underscores
-        if not re.match(r'^[a-zA-Z0-9.*_-]+$', pattern):
+        if pattern.translate(InputValidator.FILTER_DELETE):
             raise ValidationError(f"Invalid filter pattern: {pattern}")
         
         return pattern
@@ -217,15 +297,15 @@ class InputValidator:
         if not isinstance(args, list):
             raise ValidationError("Arguments must be a list")
         
-        sanitized = []
-        for arg in args:
-            if not isinstance(arg, str):
-                raise ValidationError("All arguments must be strings")
-            
-            # Check for dangerous characters
-            if InputValidator.SHELL_BLACKLIST.search(arg):
-                raise ValidationError(f"Argument contains dangerous characters: {arg}")
-            
-            sanitized.append(arg.strip())
+        if not all(isinstance(arg, str) for arg in args):
+            raise ValidationError("All arguments must be strings")
+        
+        # Check for dangerous characters in one scan over all arguments, and
+        # only look for the offending one when something was found
+        bad_chars = InputValidator.SHELL_BAD_CHARS
+        if not bad_chars.isdisjoint('\0'.join(args)):
+            for arg in args:
+                if not bad_chars.isdisjoint(arg):
+                    raise ValidationError(f"Argument contains dangerous characters: {arg}")
         
-        return sanitized
+        return [arg.strip() for arg in args]
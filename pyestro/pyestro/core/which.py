@@ -0,0 +1,44 @@
+"""
+Executable discovery for Pyestro.
+"""
+
+import os
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, Optional
+
+
+@lru_cache(maxsize=32)
+def _scan_path(names: FrozenSet[str], search_path: str) -> Dict[str, str]:
+    """Scan each PATH directory once for the given executable names."""
+    found: Dict[str, str] = {}
+
+    for directory in search_path.split(os.pathsep):
+        if not directory:
+            continue
+
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if name not in names or name in found:
+                        continue
+                    if entry.is_file() and os.access(entry.path, os.X_OK):
+                        found[name] = entry.path
+        except OSError:
+            continue
+
+        if len(found) == len(names):
+            break
+
+    return found
+
+
+def find_executables(names: Iterable[str]) -> Dict[str, Optional[str]]:
+    """Find several executables with a single walk over PATH.
+
+    Results are cached per PATH value. Names that are not found map to None,
+    and the returned dict keeps the order of ``names``.
+    """
+    names = tuple(names)
+    found = _scan_path(frozenset(names), os.environ.get("PATH", os.defpath))
+    return {name: found.get(name) for name in names}
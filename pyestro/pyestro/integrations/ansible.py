@@ -5,10 +5,16 @@ Ansible integration for Pyestro.
 import subprocess
 import shutil
 import os
+import shlex
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Union
 from ..core.config import MaestroConfig, AnsibleConfig, log_info, log_warning
 from ..core.validation import InputValidator, ValidationError
+from ..core.ansible import _dumps_compact, render_ansible_cfg
+from ..core.process import iter_output_lines
+
+# Reachability for each status word in `ansible -m ping --one-line` output
+_PING_STATUS = {"SUCCESS": True, "UNREACHABLE": False, "FAILED": False}
 
 
 class AnsibleManager:
@@ -19,6 +25,9 @@ class AnsibleManager:
         self.ansible_path = self._find_ansible()
         self.ansible_playbook_path = self._find_ansible_playbook()
         self.ansible_galaxy_path = self._find_ansible_galaxy()
+        self._env: Optional[Dict[str, str]] = None
+        # -v... flag for module and playbook runs, fixed for the manager's lifetime
+        self._verbose_args = ["-" + "v" * min(config.verbose, 4)] if config.verbose > 0 else []
     
     def _find_ansible(self) -> Optional[str]:
         """Find ansible executable."""
@@ -27,39 +36,53 @@ class AnsibleManager:
             log_warning("ansible executable not found in PATH")
         return ansible_path
     
+    def _find_beside_ansible(self, name: str) -> Optional[str]:
+        """Find an Ansible tool, checking the ansible executable's directory first."""
+        # The tools are installed together, so this is usually a single
+        # access() call instead of another walk over every PATH entry
+        if self.ansible_path:
+            tool_path = shutil.which(name, path=os.path.dirname(self.ansible_path))
+            if tool_path:
+                return tool_path
+        return shutil.which(name)
+    
     def _find_ansible_playbook(self) -> Optional[str]:
         """Find ansible-playbook executable."""
-        playbook_path = shutil.which("ansible-playbook")
+        playbook_path = self._find_beside_ansible("ansible-playbook")
         if not playbook_path:
             log_warning("ansible-playbook executable not found in PATH")
         return playbook_path
     
     def _find_ansible_galaxy(self) -> Optional[str]:
         """Find ansible-galaxy executable."""
-        galaxy_path = shutil.which("ansible-galaxy")
+        galaxy_path = self._find_beside_ansible("ansible-galaxy")
         if not galaxy_path:
             log_warning("ansible-galaxy executable not found in PATH")
         return galaxy_path
     
-    def _setup_environment(self) -> Dict[str, str]:
-        """Setup environment variables for Ansible."""
-        env = os.environ.copy()
-        
-        # Set inventory path
-        inventory_path = self.config.merged_inventory_dir / "hosts"
-        env["ANSIBLE_INVENTORY"] = str(inventory_path)
+    def _ansible_env_overrides(self) -> Dict[str, str]:
+        """Environment variables Pyestro sets for every Ansible command."""
+        overrides = {
+            # Set inventory path
+            "ANSIBLE_INVENTORY": str(self.config.inventory_hosts_path),
+            # Set other Ansible variables
+            "ANSIBLE_HOST_KEY_CHECKING": "False",
+            "ANSIBLE_TIMEOUT": str(self.config.ansible.timeout),
+        }
         
         # Set config file if specified
         if self.config.ansible.config_file:
             config_path = Path(self.config.ansible.config_file)
             if config_path.exists():
-                env["ANSIBLE_CONFIG"] = str(config_path)
-        
-        # Set other Ansible variables
-        env["ANSIBLE_HOST_KEY_CHECKING"] = "False"
-        env["ANSIBLE_TIMEOUT"] = str(self.config.ansible.timeout)
+                overrides["ANSIBLE_CONFIG"] = str(config_path)
         
-        return env
+        return overrides
+    
+    def _setup_environment(self) -> Dict[str, str]:
+        """Setup environment variables for Ansible (built once per manager)."""
+        if self._env is None:
+            self._env = {**os.environ, **self._ansible_env_overrides()}
+        return self._env
     
     def execute_module(
         self,
@@ -81,28 +104,23 @@ class AnsibleManager:
             log_warning(f"Invalid module name: {e}")
             return False
         
-        cmd = [self.ansible_path, hosts, "-m", module_name]
-        
-        if module_args:
-            cmd.extend(["-a", module_args])
-        
-        if become:
-            cmd.append("--become")
-        
-        if check_mode or self.config.dry_run:
-            cmd.append("--check")
+        cmd = [
+            self.ansible_path, hosts, "-m", module_name,
+            *(("-a", module_args) if module_args else ()),
+            *(("--become",) if become else ()),
+            *(("--check",) if check_mode or self.config.dry_run else ()),
+        ]
         
+        # Pass extra variables as JSON so values keep their spaces and quotes
         if extra_vars:
-            extra_vars_str = " ".join([f"{k}={v}" for k, v in extra_vars.items()])
-            cmd.extend(["-e", extra_vars_str])
+            cmd.extend(["-e", _dumps_compact(extra_vars)])
         
-        if self.config.verbose > 0:
-            cmd.append("-" + "v" * min(self.config.verbose, 4))
+        cmd.extend(self._verbose_args)
         
         log_info(f"Executing Ansible module: {module_name}")
         
         if self.config.dry_run:
-            log_info(f"DRY RUN: Would execute: {' '.join(cmd)}")
+            log_info(f"DRY RUN: Would execute: {shlex.join(cmd)}")
             return True
         
         try:
@@ -148,25 +166,19 @@ class AnsibleManager:
             log_warning(f"Playbook not found: {playbook_path}")
             return False
         
-        cmd = [self.ansible_playbook_path, str(playbook_path)]
-        
-        if hosts:
-            cmd.extend(["-l", hosts])
-        
-        if become:
-            cmd.append("--become")
+        cmd = [
+            self.ansible_playbook_path, str(playbook_path),
+            *(("-l", hosts) if hosts else ()),
+            *(("--become",) if become else ()),
+            *(("--check",) if check_mode or self.config.dry_run else ()),
+        ]
         
-        if check_mode or self.config.dry_run:
-            cmd.append("--check")
-        
-        if extra_vars:
-            # Build extra vars string
-            extra_vars_list = []
-            for k, v in extra_vars.items():
-                extra_vars_list.append(f"{k}={v}")
-            # Add workdir and other standard vars
-            extra_vars_list.append(f"workdir={self.config.work_dir}")
-            cmd.extend(["-e", " ".join(extra_vars_list)])
+        # Every playbook gets workdir; extra variables go in the same JSON
+        # document so values keep their spaces and quotes
+        cmd.extend(["-e", _dumps_compact({
+            **(extra_vars or {}),
+            "workdir": str(self.config.work_dir),
+        })])
         
         if tags:
             cmd.extend(["--tags", ",".join(tags)])
@@ -174,13 +186,12 @@ class AnsibleManager:
         if skip_tags:
             cmd.extend(["--skip-tags", ",".join(skip_tags)])
         
-        if self.config.verbose > 0:
-            cmd.append("-" + "v" * min(self.config.verbose, 4))
+        cmd.extend(self._verbose_args)
         
         log_info(f"Executing playbook: {playbook_path}")
         
         if self.config.dry_run:
-            log_info(f"DRY RUN: Would execute: {' '.join(cmd)}")
+            log_info(f"DRY RUN: Would execute: {shlex.join(cmd)}")
             return True
         
         try:
@@ -220,7 +231,7 @@ class AnsibleManager:
             log_info("No galaxy requirements file found, skipping role installation")
             return True
         
-        roles_dir = self.config.maestro_dir / self.config.ansible.galaxy_roles_dir
+        roles_dir = self.config.ansible_roles_path
         roles_dir.mkdir(exist_ok=True)
         
         cmd = [
@@ -234,7 +245,7 @@ class AnsibleManager:
         log_info(f"Installing Galaxy roles from {requirements_file}")
         
         if self.config.dry_run:
-            log_info(f"DRY RUN: Would execute: {' '.join(cmd)}")
+            log_info(f"DRY RUN: Would execute: {shlex.join(cmd)}")
             return True
         
         try:
@@ -269,27 +280,21 @@ class AnsibleManager:
         log_info(f"Testing connectivity to: {hosts}")
         
         if self.config.dry_run:
-            log_info(f"DRY RUN: Would execute: {' '.join(cmd)}")
+            log_info(f"DRY RUN: Would execute: {shlex.join(cmd)}")
             return {"example_host": True}
         
         try:
             env = self._setup_environment()
-            result = subprocess.run(
-                cmd,
-                env=env,
-                capture_output=True,
-                text=True
-            )
             
-            # Parse output to determine which hosts are reachable
+            # Parse output as it streams in to determine which hosts are reachable
             connectivity = {}
-            for line in result.stdout.splitlines():
-                if " | SUCCESS" in line:
-                    host = line.split(" | ")[0].strip()
-                    connectivity[host] = True
-                elif " | UNREACHABLE" in line or " | FAILED" in line:
-                    host = line.split(" | ")[0].strip()
-                    connectivity[host] = False
+            for line in iter_output_lines(cmd, env=env):
+                host, sep, rest = line.partition(" | ")
+                if not sep:
+                    continue
+                reachable = _PING_STATUS.get(rest.partition(" ")[0].rstrip("!:"))
+                if reachable is not None:
+                    connectivity[host.strip()] = reachable
             
             return connectivity
             
@@ -311,16 +316,9 @@ class AnsibleManager:
         
         try:
             env = self._setup_environment()
-            result = subprocess.run(
-                cmd,
-                env=env,
-                capture_output=True,
-                text=True,
-                check=True
-            )
             
             hosts = []
-            for line in result.stdout.splitlines():
+            for line in iter_output_lines(cmd, env=env, check=True):
                 line = line.strip()
                 if line and not line.startswith("hosts ("):
                     hosts.append(line)
@@ -339,16 +337,7 @@ class AnsibleManager:
             log_info(f"ansible.cfg already exists: {config_path}")
             return True
         
-        config_content = f"""[defaults]
-inventory = {self.config.merged_inventory_dir}/hosts
-host_key_checking = False
-timeout = {self.config.ansible.timeout}
-ansible_managed = {self.config.ansible.managed_banner}
-roles_path = {self.config.ansible.galaxy_roles_dir}
-
-[ssh_connection]
-scp_if_ssh = {"True" if self.config.ansible.scp_if_ssh else "False"}
-"""
+        config_content = render_ansible_cfg(self.config, self.config.ansible.galaxy_roles_dir)
         
         log_info(f"Creating ansible.cfg: {config_path}")
         
@@ -358,8 +347,7 @@ scp_if_ssh = {"True" if self.config.ansible.scp_if_ssh else "False"}
             return True
         
         try:
-            with open(config_path, 'w', encoding='utf-8') as f:
-                f.write(config_content)
+            config_path.write_bytes(config_content.encode("utf-8"))
             log_info("ansible.cfg created successfully")
             return True
         except Exception as e:
@@ -2,30 +2,79 @@
 Reclass integration for Pyestro.
 """
 
+import os
 import subprocess
 import json
+import shlex
 import shutil
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import fnmatchcase
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
-from ..core.config import log_info, log_warning
+from typing import AbstractSet, Any, Dict, FrozenSet, List, Optional, Tuple, Union
+from ..core.config import info_enabled, log_info, log_warning
+from ..core.process import run_json
 from ..core.validation import InputValidator, ValidationError
 
 
 class ReclassManager:
     """Manages reclass operations and parsing."""
     
+    # Single-node lookups tolerated before get_node_data prefetches everything
+    PREFETCH_AFTER_MISSES = 3
+    
     def __init__(self, inventory_dir: Path, dry_run: bool = True):
         self.inventory_dir = inventory_dir
         self.dry_run = dry_run
         self.reclass_path = self._find_reclass()
+        self._inventory_dir_str = str(inventory_dir)
+        # Parsed reclass output, kept until invalidate_cache() is called
+        self._inventory_cache: Optional[Dict[str, Any]] = None
+        self._node_cache: Dict[str, Dict[str, Any]] = {}
+        # Reverse class -> nodes index over the cached inventory, built on demand
+        self._class_index: Optional[Dict[str, List[str]]] = None
+        self._nodes_set: Optional[FrozenSet[str]] = None
+        # filter_nodes results per (node, class, project) filter combination
+        self._filter_cache: Dict[Tuple[Optional[str], Optional[str], Optional[str]], Tuple[str, ...]] = {}
+        # Parameter path (as a tuple of keys) -> {node: value}, built on demand
+        self._param_index: Optional[Dict[Tuple[str, ...], Dict[str, Any]]] = None
+        # Single-node reclass runs by get_node_data since the last prefetch
+        self._node_misses = 0
+        # Set when an automatic prefetch failed, so it is not retried per miss
+        self._prefetch_failed = False
+    
+    def invalidate_cache(self) -> None:
+        """Forget cached reclass output, e.g. after the inventory changed."""
+        self._inventory_cache = None
+        self._node_cache.clear()
+        self._class_index = None
+        self._nodes_set = None
+        self._filter_cache.clear()
+        self._param_index = None
+        self._node_misses = 0
+        self._prefetch_failed = False
     
-    def _find_reclass(self) -> Optional[str]:
-        """Find reclass executable."""
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _find_reclass() -> Optional[str]:
+        """Find reclass executable (looked up once per process)."""
         reclass_path = shutil.which("reclass")
         if not reclass_path:
             log_warning("reclass executable not found in PATH")
         return reclass_path
     
+    def prefetch_all(self) -> None:
+        """Load every node's data with a single reclass run.
+        
+        get_node_data and get_many_node_data call this on their own once more
+        than PREFETCH_AFTER_MISSES nodes miss the cache; callers that know they
+        will look up many nodes can call it up front.
+        """
+        inventory_data = self.get_inventory_data()
+        if inventory_data and "nodes" in inventory_data:
+            self._node_cache.update(inventory_data["nodes"])
+    
     def get_node_data(self, node_name: str) -> Optional[Dict[str, Any]]:
         """Get data for a specific node from reclass."""
         if not self.reclass_path:
@@ -38,9 +87,34 @@ class ReclassManager:
             log_warning(f"Invalid node name: {e}")
             return None
         
+        # Each reclass run pays interpreter startup and a full class parse;
+        # after a few single-node misses, assume more lookups follow and
+        # render every node with one run instead
+        if (node_name not in self._node_cache and self._inventory_cache is None
+                and not self.dry_run and not self._prefetch_failed):
+            self._node_misses += 1
+            if self._node_misses > self.PREFETCH_AFTER_MISSES:
+                self.prefetch_all()
+                # Don't re-run a failing inventory render on every later miss
+                self._prefetch_failed = self._inventory_cache is None
+        
+        return self._get_node_data_unchecked(node_name)
+    
+    def _get_node_data_unchecked(self, node_name: str) -> Optional[Dict[str, Any]]:
+        """get_node_data for a name that is already sanitized (reclass must be available)."""
+        if node_name in self._node_cache:
+            return self._node_cache[node_name]
+        
+        # A loaded inventory already holds every rendered node
+        if self._inventory_cache is not None:
+            node_data = self._inventory_cache.get("nodes", {}).get(node_name)
+            if node_data is not None:
+                self._node_cache[node_name] = node_data
+                return node_data
+        
         cmd = [
             self.reclass_path,
-            "-b", str(self.inventory_dir),
+            "-b", self._inventory_dir_str,
             "-n", node_name,
             "--output", "json"
         ]
@@ -48,17 +122,14 @@ class ReclassManager:
         log_info(f"Getting data for node: {node_name}")
         
         if self.dry_run:
-            log_info(f"DRY RUN: Would execute: {' '.join(cmd)}")
+            if info_enabled():
+                log_info(f"DRY RUN: Would execute: {shlex.join(cmd)}")
             return {"parameters": {}, "classes": [], "applications": []}
         
         try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            return json.loads(result.stdout)
+            node_data = run_json(cmd)
+            self._node_cache[node_name] = node_data
+            return node_data
         except subprocess.CalledProcessError as e:
             log_warning(f"reclass failed for node {node_name}: {e.stderr}")
             return None
@@ -66,15 +137,55 @@ class ReclassManager:
             log_warning(f"Failed to parse reclass output for node {node_name}: {e}")
             return None
     
+    def get_many_node_data(self, node_names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get data for several nodes, running the reclass lookups concurrently.
+        
+        Nodes that fail to render are left out of the result.
+        """
+        if not self.reclass_path:
+            log_warning("reclass not available")
+            return {}
+        
+        # Validate every name once up front, so the workers can skip it
+        names = []
+        for node_name in node_names:
+            try:
+                names.append(InputValidator.sanitize_node_name(node_name))
+            except ValidationError as e:
+                log_warning(f"Invalid node name: {e}")
+        names = list(dict.fromkeys(names))
+        
+        # Past a few uncached names one inventory render beats a run per node
+        missing = [name for name in names if name not in self._node_cache]
+        if (len(missing) > self.PREFETCH_AFTER_MISSES and not self.dry_run
+                and not self._prefetch_failed):
+            self.prefetch_all()
+            self._prefetch_failed = self._inventory_cache is None
+            missing = [name for name in names if name not in self._node_cache]
+        
+        if self.dry_run or len(missing) < 2:
+            # Nothing worth overlapping; dry runs only log
+            results = [self._get_node_data_unchecked(name) for name in names]
+        else:
+            # Each uncached lookup waits on its own reclass process, so overlap them
+            workers = min(32, (os.cpu_count() or 4) * 2, len(missing))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(self._get_node_data_unchecked, names))
+        
+        return {name: data for name, data in zip(names, results) if data is not None}
+    
     def get_inventory_data(self) -> Optional[Dict[str, Any]]:
         """Get complete inventory data from reclass."""
         if not self.reclass_path:
             log_warning("reclass not available")
             return None
         
+        if self._inventory_cache is not None:
+            return self._inventory_cache
+        
         cmd = [
             self.reclass_path,
-            "-b", str(self.inventory_dir),
+            "-b", self._inventory_dir_str,
             "--inventory",
             "--output", "json"
         ]
@@ -82,17 +193,20 @@ class ReclassManager:
         log_info("Getting inventory data")
         
         if self.dry_run:
-            log_info(f"DRY RUN: Would execute: {' '.join(cmd)}")
+            if info_enabled():
+                log_info(f"DRY RUN: Would execute: {shlex.join(cmd)}")
             return {"nodes": {}, "classes": {}}
         
         try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            return json.loads(result.stdout)
+            inventory_data = run_json(cmd)
+            # Class names repeat across most nodes; share one string object
+            # per name (object keys are already deduplicated by the parser)
+            for node_data in inventory_data.get("nodes", {}).values():
+                classes = node_data.get("classes")
+                if classes:
+                    node_data["classes"] = [sys.intern(cls) for cls in classes]
+            self._inventory_cache = inventory_data
+            return inventory_data
         except subprocess.CalledProcessError as e:
             log_warning(f"reclass inventory failed: {e.stderr}")
             return None
@@ -107,6 +221,15 @@ class ReclassManager:
             return list(inventory_data["nodes"].keys())
         return []
     
+    def nodes_set(self) -> FrozenSet[str]:
+        """All node names as a set for membership tests (cached with the inventory)."""
+        if self._nodes_set is None:
+            inventory_data = self.get_inventory_data()
+            if not inventory_data or "nodes" not in inventory_data:
+                return frozenset()
+            self._nodes_set = frozenset(inventory_data["nodes"])
+        return self._nodes_set
+    
     def list_classes(self) -> List[str]:
         """List all available classes."""
         inventory_data = self.get_inventory_data()
@@ -130,52 +253,62 @@ class ReclassManager:
     
     def get_nodes_by_class(self, class_name: str) -> List[str]:
         """Get all nodes that use a specific class."""
-        inventory_data = self.get_inventory_data()
-        if not inventory_data or "nodes" not in inventory_data:
-            return []
-        
-        matching_nodes = []
-        for node_name, node_data in inventory_data["nodes"].items():
-            if "classes" in node_data and class_name in node_data["classes"]:
-                matching_nodes.append(node_name)
+        if self._class_index is None:
+            inventory_data = self.get_inventory_data()
+            if not inventory_data or "nodes" not in inventory_data:
+                return []
+            
+            # One pass over the inventory answers every later class lookup
+            class_index: Dict[str, List[str]] = {}
+            for node_name, node_data in inventory_data["nodes"].items():
+                for cls in dict.fromkeys(node_data.get("classes", ())):
+                    class_index.setdefault(cls, []).append(node_name)
+            self._class_index = class_index
         
-        return matching_nodes
+        return list(self._class_index.get(class_name, ()))
     
     def search_parameter(self, parameter_path: str) -> Dict[str, Any]:
         """Search for a parameter across all nodes."""
-        inventory_data = self.get_inventory_data()
-        if not inventory_data or "nodes" not in inventory_data:
-            return {}
-        
-        results = {}
-        path_parts = parameter_path.split(":")
+        if self._param_index is None:
+            inventory_data = self.get_inventory_data()
+            if not inventory_data or "nodes" not in inventory_data:
+                return {}
+            self._param_index = self._build_parameter_index(inventory_data["nodes"])
         
-        for node_name, node_data in inventory_data["nodes"].items():
-            if "parameters" not in node_data:
+        return dict(self._param_index.get(tuple(parameter_path.split(":")), {}))
+    
+    @staticmethod
+    def _build_parameter_index(nodes: Dict[str, Any]) -> Dict[Tuple[str, ...], Dict[str, Any]]:
+        """Index every parameter path of every node, so searches are one lookup."""
+        # Paths are tuples rather than "a:b" strings, so keys that themselves
+        # contain ':' cannot collide with nested ones
+        index: Dict[Tuple[str, ...], Dict[str, Any]] = {}
+        for node_name, node_data in nodes.items():
+            parameters = node_data.get("parameters")
+            if not isinstance(parameters, dict):
                 continue
             
-            # Navigate through parameter path
-            current = node_data["parameters"]
-            try:
-                for part in path_parts:
-                    if isinstance(current, dict) and part in current:
-                        current = current[part]
-                    else:
-                        current = None
-                        break
-                
-                if current is not None:
-                    results[node_name] = current
-            except (KeyError, TypeError):
-                continue
+            stack = [((), parameters)]
+            while stack:
+                prefix, current = stack.pop()
+                for key, value in current.items():
+                    path = prefix + (key,)
+                    if value is not None:
+                        index.setdefault(path, {})[node_name] = value
+                    if isinstance(value, dict):
+                        stack.append((path, value))
         
-        return results
+        return index
     
     def validate_inventory(self) -> List[str]:
         """Validate the reclass inventory and return any errors."""
         errors = []
         
-        if not self.inventory_dir.exists():
+        # One directory read answers both the existence and subdirectory checks
+        try:
+            with os.scandir(self.inventory_dir) as entries:
+                subdirs = {entry.name for entry in entries if entry.is_dir()}
+        except OSError:
             errors.append(f"Inventory directory does not exist: {self.inventory_dir}")
             return errors
         
@@ -191,9 +324,8 @@ class ReclassManager:
         # Check for required subdirectories
         required_dirs = ["nodes", "classes"]
         for dir_name in required_dirs:
-            dir_path = self.inventory_dir / dir_name
-            if not dir_path.exists():
-                errors.append(f"Required directory missing: {dir_path}")
+            if dir_name not in subdirs:
+                errors.append(f"Required directory missing: {self.inventory_dir / dir_name}")
         
         return errors
     
@@ -201,52 +333,70 @@ class ReclassManager:
         self,
         node_filter: Optional[str] = None,
         class_filter: Optional[str] = None,
-        project_filter: Optional[str] = None
+        project_filter: Optional[str] = None,
+        sort: bool = True
     ) -> List[str]:
-        """Filter nodes based on various criteria."""
-        all_nodes = self.list_nodes()
+        """Filter nodes based on various criteria.
         
+        With sort=False the matching nodes come back in no particular order,
+        skipping the final sort for callers that only iterate or intersect.
+        """
         if not any([node_filter, class_filter, project_filter]):
-            return all_nodes
+            return self.list_nodes()
+        
+        # Repeated calls with the same filters reuse the earlier result
+        filter_key = (node_filter, class_filter, project_filter)
+        if filter_key in self._filter_cache:
+            return list(self._filter_cache[filter_key])
+        
+        filtered_nodes: Optional[AbstractSet[str]] = None
+        
+        # Apply class filter first: it is a lookup in the reverse class index
+        # and usually the most selective, so later stages see fewer nodes
+        if class_filter:
+            try:
+                class_filter = InputValidator.validate_filter_pattern(class_filter)
+                filtered_nodes = set(self.get_nodes_by_class(class_filter))
+            except ValidationError as e:
+                log_warning(f"Invalid class filter: {e}")
         
-        filtered_nodes = set(all_nodes)
+        if filtered_nodes is None:
+            filtered_nodes = self.nodes_set()
         
         # Apply node filter
         if node_filter:
             try:
                 node_filter = InputValidator.validate_filter_pattern(node_filter)
                 if "*" in node_filter:
-                    # Simple wildcard matching
-                    pattern = node_filter.replace("*", ".*")
-                    import re
-                    regex = re.compile(pattern)
-                    filtered_nodes = {n for n in filtered_nodes if regex.match(n)}
+                    # Shell-style wildcard matching (fnmatch caches the compiled pattern)
+                    filtered_nodes = {n for n in filtered_nodes if fnmatchcase(n, node_filter)}
                 else:
                     # Exact match
-                    filtered_nodes = {n for n in filtered_nodes if n == node_filter}
+                    filtered_nodes = filtered_nodes & {node_filter}
             except ValidationError as e:
                 log_warning(f"Invalid node filter: {e}")
         
-        # Apply class filter
-        if class_filter:
-            try:
-                class_filter = InputValidator.validate_filter_pattern(class_filter)
-                nodes_with_class = set(self.get_nodes_by_class(class_filter))
-                filtered_nodes = filtered_nodes.intersection(nodes_with_class)
-            except ValidationError as e:
-                log_warning(f"Invalid class filter: {e}")
-        
         # Apply project filter (assuming project is a parameter)
         if project_filter:
             try:
                 project_filter = InputValidator.validate_filter_pattern(project_filter)
+                # Read parameters from the (cached) inventory instead of
+                # running reclass once per node
+                nodes_data = (self.get_inventory_data() or {}).get("nodes", {}) if filtered_nodes else {}
                 project_nodes = set()
                 for node in filtered_nodes:
-                    params = self.get_node_parameters(node)
+                    params = nodes_data.get(node, {}).get("parameters", {})
                     if params.get("project") == project_filter:
                         project_nodes.add(node)
                 filtered_nodes = project_nodes
             except ValidationError as e:
                 log_warning(f"Invalid project filter: {e}")
         
-        return sorted(list(filtered_nodes))
+        if not sort:
+            return list(filtered_nodes)
+        
+        result = sorted(filtered_nodes)
+        # Only remember results computed from a successfully loaded inventory
+        if self._inventory_cache is not None:
+            self._filter_cache[filter_key] = tuple(result)
+        return result
@@ -0,0 +1,35 @@
+"""
+Shared fixtures for the Pyestro test suite.
+"""
+
+import stat
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture
+def make_script(tmp_path):
+    """Create an executable shell script that logs its arguments.
+
+    Returns a factory ``make_script(name, body)`` giving the script path; each
+    invocation appends its arguments to ``<name>.log`` next to it.
+    """
+    def factory(name: str, body: str) -> Path:
+        script = tmp_path / name
+        log_file = tmp_path / f"{name}.log"
+        script.write_text(f'#!/bin/sh\necho "$@" >> "{log_file}"\n{body}\n')
+        script.chmod(script.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+        return script
+    return factory
+
+
+@pytest.fixture
+def invocations():
+    """Return a helper listing the argument lines logged by a make_script script."""
+    def read(script: Path):
+        log_file = script.with_name(script.name + ".log")
+        if not log_file.exists():
+            return []
+        return log_file.read_text().splitlines()
+    return read
@@ -0,0 +1,43 @@
+"""
+Tests for batched module execution in the core AnsibleManager.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from pyestro.core.ansible import AnsibleManager
+from pyestro.core.config import MaestroConfig
+
+
+@pytest.fixture
+def batch(make_script, tmp_path):
+    """An AnsibleManager whose ansible-playbook is a fake that needs a non-empty playbook."""
+    config = MaestroConfig()
+    config.work_dir = tmp_path / "work"
+    script = make_script("ansible-playbook", 'test -s "$1"')
+    manager = AnsibleManager(config)
+    manager.ansible_playbook_path = str(script)
+    return manager, script
+
+
+def test_batch_dry_run_only_logs(batch, invocations, capsys):
+    manager, script = batch
+    manager.config.dry_run = True
+    
+    assert manager.ping_and_gather_facts()
+    assert invocations(script) == []
+    assert '"ping"' in capsys.readouterr().out
+
+
+def test_concurrent_batches_use_separate_playbooks(batch, invocations):
+    manager, script = batch
+    manager.config.dry_run = False
+    
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(lambda _: manager.ping_and_gather_facts(), range(8)))
+    
+    assert all(results)
+    assert len({line.split()[0] for line in invocations(script)}) == 8
+    # Every temporary playbook is removed afterwards
+    assert list(manager.config.work_dir.iterdir()) == []
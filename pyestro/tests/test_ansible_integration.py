@@ -0,0 +1,57 @@
+"""
+Tests for command construction in the integrations AnsibleManager.
+"""
+
+import json
+
+import pytest
+
+from pyestro.core.config import MaestroConfig
+from pyestro.integrations.ansible import AnsibleManager
+
+
+@pytest.fixture
+def ansible(make_script, tmp_path):
+    """An AnsibleManager whose ansible tools write one argument per line."""
+    config = MaestroConfig(work_dir=tmp_path / "work", dry_run=False)
+    manager = AnsibleManager(config)
+    body = 'for arg in "$@"; do echo "$arg"; done > "$0.args"'
+    manager.ansible_path = str(make_script("ansible", body))
+    manager.ansible_playbook_path = str(make_script("ansible-playbook", body))
+    return manager
+
+
+def arguments(tool_path):
+    """The arguments of a tool's last run, one per list entry."""
+    with open(f"{tool_path}.args") as f:
+        return f.read().splitlines()
+
+
+def extra_vars(args):
+    """Parse every -e argument as JSON."""
+    return [json.loads(args[i + 1]) for i, arg in enumerate(args) if arg == "-e"]
+
+
+def test_module_extra_vars_keep_spaces(ansible):
+    variables = {"motd": "hello world", "quote": "it's"}
+    assert ansible.execute_module("ping", extra_vars=variables)
+    assert extra_vars(arguments(ansible.ansible_path)) == [variables]
+
+
+def test_module_without_extra_vars_has_no_e_option(ansible):
+    assert ansible.execute_module("ping")
+    assert "-e" not in arguments(ansible.ansible_path)
+
+
+def test_playbook_always_gets_workdir(ansible, tmp_path):
+    playbook = tmp_path / "site.yml"
+    playbook.write_text("- hosts: all\n")
+    workdir = str(ansible.config.work_dir)
+    
+    assert ansible.execute_playbook(playbook)
+    assert extra_vars(arguments(ansible.ansible_playbook_path)) == [{"workdir": workdir}]
+    
+    assert ansible.execute_playbook(playbook, extra_vars={"motd": "hello world"})
+    assert extra_vars(arguments(ansible.ansible_playbook_path)) == [
+        {"motd": "hello world", "workdir": workdir}
+    ]
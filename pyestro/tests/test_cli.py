@@ -0,0 +1,38 @@
+"""
+Tests for the command line front end.
+"""
+
+import pytest
+
+from pyestro.cli.main import CLI
+from pyestro.core import config
+from pyestro.core.config import LOG_INFO, info_enabled, log_info, log_warning
+
+
+@pytest.fixture(autouse=True)
+def restore_log_level():
+    """Undo any log level change a test makes."""
+    yield
+    config.set_log_level(LOG_INFO)
+
+
+def test_quiet_silences_info_messages(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    assert info_enabled()
+    
+    assert CLI().run(["-q", "-n", "create", "--list"]) == 0
+    assert not info_enabled()
+    capsys.readouterr()
+    
+    log_info("hidden")
+    log_warning("shown")
+    assert capsys.readouterr().out == "WARNING: shown\n"
+
+
+def test_info_messages_are_shown_by_default(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    assert CLI().run(["-n", "create", "--list"]) == 0
+    assert info_enabled()
+    
+    log_info("shown")
+    assert capsys.readouterr().out.endswith("INFO: shown\n")
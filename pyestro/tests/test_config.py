@@ -0,0 +1,50 @@
+"""
+Tests for configuration file discovery and validation.
+"""
+
+import pytest
+
+from pyestro.core.config import ConfigManager, MaestroConfig
+
+
+def test_find_config_file_skips_directories(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "pyestro.yaml").mkdir()
+    (tmp_path / "pyestro.json").write_text("{}")
+    
+    assert ConfigManager()._find_config_file() == tmp_path / "pyestro.json"
+
+
+def test_find_config_file_follows_symlinks(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "shared.yaml").write_text("dry_run: true\n")
+    (tmp_path / ".pyestro.yml").symlink_to(tmp_path / "shared.yaml")
+    (tmp_path / "pyestro.yml").symlink_to(tmp_path / "missing.yaml")
+    
+    assert ConfigManager()._find_config_file() == tmp_path / ".pyestro.yml"
+
+
+def test_find_config_file_without_candidates(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    
+    assert ConfigManager()._find_config_file() is None
+
+
+@pytest.mark.parametrize("url", [
+    "https://github.com/user/repo.git",
+    "ssh://git@example.com/repo.git",
+    "git://example.com/repo.git",
+    "git@github.com:user/repo.git",
+])
+def test_repository_urls_accepted(url):
+    assert MaestroConfig(repositories={"repo": url}).repositories == {"repo": url}
+
+
+@pytest.mark.parametrize("url, message", [
+    ("", "Invalid repository URL for bad"),
+    (None, "Invalid repository URL for bad"),
+    ("ftp://example.com/repo.git", "Invalid repository URL format for bad"),
+])
+def test_repository_urls_rejected(url, message):
+    with pytest.raises(ValueError, match=message):
+        MaestroConfig(repositories={"good": "https://example.com/repo.git", "bad": url})
@@ -0,0 +1,81 @@
+"""
+Tests for FileManager's in-kernel file copy.
+"""
+
+import errno
+import os
+
+import pytest
+
+from pyestro.core import file_ops
+from pyestro.core.file_ops import FileManager
+
+
+@pytest.fixture
+def source(tmp_path):
+    """A source file larger than one copy chunk, with a distinctive mode and mtime."""
+    src = tmp_path / "src.bin"
+    src.write_bytes(os.urandom(3 * 1024 * 1024 + 17))
+    src.chmod(0o640)
+    os.utime(src, ns=(1_600_000_000_000_000_000, 1_600_000_000_123_456_789))
+    return src
+
+
+def assert_copied(src, dst):
+    assert dst.read_bytes() == src.read_bytes()
+    src_st, dst_st = src.stat(), dst.stat()
+    assert dst_st.st_mode & 0o7777 == 0o640
+    assert dst_st.st_mtime_ns == src_st.st_mtime_ns
+
+
+def test_copy_file_preserves_content_and_metadata(source, tmp_path):
+    dst = tmp_path / "dst.bin"
+    FileManager._copy_file(str(source), str(dst))
+    assert_copied(source, dst)
+
+
+def test_copy_file_overwrites_existing_file(source, tmp_path):
+    dst = tmp_path / "dst.bin"
+    dst.write_bytes(b"x" * (8 * 1024 * 1024))
+    FileManager._copy_file(str(source), str(dst))
+    assert_copied(source, dst)
+
+
+def test_copy_file_falls_back_when_kernel_copy_is_unsupported(source, tmp_path, monkeypatch):
+    def unsupported(src_fd, dst_fd, count):
+        raise OSError(errno.EXDEV, "cross-device")
+    
+    calls = []
+    def sendfile(src_fd, dst_fd, count):
+        calls.append(count)
+        raise OSError(errno.EINVAL, "unsupported")
+    
+    monkeypatch.setattr(file_ops, "_copy_file_range", unsupported)
+    monkeypatch.setattr(file_ops, "_sendfile", sendfile)
+    dst = tmp_path / "dst.bin"
+    FileManager._copy_file(str(source), str(dst))
+    assert calls
+    assert_copied(source, dst)
+
+
+def test_copy_file_finishes_short_kernel_copy_in_userspace(source, tmp_path, monkeypatch):
+    # Copy one chunk in the kernel, then report end of file early
+    def short_copy(src_fd, dst_fd, count):
+        if os.lseek(src_fd, 0, os.SEEK_CUR):
+            return 0
+        return os.write(dst_fd, os.read(src_fd, 4096))
+    
+    monkeypatch.setattr(file_ops, "_copy_file_range", short_copy)
+    dst = tmp_path / "dst.bin"
+    FileManager._copy_file(str(source), str(dst))
+    assert_copied(source, dst)
+
+
+def test_copy_file_raises_unexpected_errors(source, tmp_path, monkeypatch):
+    def no_space(src_fd, dst_fd, count):
+        raise OSError(errno.ENOSPC, "no space left")
+    
+    monkeypatch.setattr(file_ops, "_copy_file_range", no_space)
+    with pytest.raises(OSError) as excinfo:
+        FileManager._copy_file(str(source), str(tmp_path / "dst.bin"))
+    assert excinfo.value.errno == errno.ENOSPC
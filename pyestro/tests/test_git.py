@@ -0,0 +1,122 @@
+"""
+Tests for the core GitManager.
+"""
+
+import shutil
+import subprocess
+
+import pytest
+
+from pyestro.core.config import MaestroConfig
+from pyestro.core.git import GitManager
+
+
+@pytest.fixture
+def git(make_script):
+    """A GitManager whose git is a fake that only logs its arguments."""
+    script = make_script("git", "exit 0")
+    manager = GitManager(dry_run=False)
+    manager.git_path = str(script)
+    return manager, script
+
+
+def test_clone_options_come_from_config(git, invocations, tmp_path):
+    manager, script = git
+    config = MaestroConfig(
+        repositories={"inventory": "https://example.com/inventory.git"},
+        blobless_clone=True,
+        submodule_jobs=4,
+    )
+    repo_config = config.get_repository_configs()[0]
+    target = tmp_path / "inventory"
+    
+    assert manager.clone_repository(repo_config, target)
+    assert invocations(script) == [
+        f"clone https://example.com/inventory.git {target} --depth=1 --single-branch "
+        "--filter=blob:none --recurse-submodules --jobs 4"
+    ]
+
+
+def test_clone_defaults_add_no_extra_options(git, invocations, tmp_path):
+    manager, script = git
+    config = MaestroConfig(
+        repositories={"inventory": "https://example.com/inventory.git"},
+        shallow_clone=False,
+    )
+    target = tmp_path / "inventory"
+    
+    assert manager.clone_repository(config.get_repository_configs()[0], target)
+    assert invocations(script) == [f"clone https://example.com/inventory.git {target}"]
+
+
+requires_git = pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+
+
+@pytest.fixture
+def git_repo(tmp_path):
+    """A real repository with one commit on branch 'trunk', and a git runner for it."""
+    repo_dir = tmp_path / "repo"
+    repo_dir.mkdir()
+    
+    def run(*args):
+        subprocess.run(
+            ["git", "-c", "user.name=Test", "-c", "user.email=test@example.com", *args],
+            cwd=repo_dir, check=True, capture_output=True
+        )
+    
+    run("init", "-q", "-b", "trunk")
+    (repo_dir / "README").write_text("hello\n")
+    run("add", "README")
+    run("commit", "-q", "-m", "initial")
+    return repo_dir, run
+
+
+def head(repo_dir):
+    """Get the full commit hash of HEAD."""
+    return subprocess.run(
+        ["git", "rev-parse", "HEAD"], cwd=repo_dir, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+@requires_git
+def test_status_of_clean_repository(git_repo):
+    repo, _ = git_repo
+    status = GitManager(dry_run=False).get_repository_status(repo)
+    assert status == {
+        "branch": "trunk",
+        "commit": head(repo)[:8],
+        "has_changes": False,
+        "path": str(repo),
+    }
+
+
+@requires_git
+def test_status_reports_changes(git_repo):
+    repo, run = git_repo
+    manager = GitManager(dry_run=False)
+    (repo / "README").write_text("changed\n")
+    assert manager.get_repository_status(repo)["has_changes"]
+    
+    run("checkout", "-q", "README")
+    (repo / "untracked").write_text("new\n")
+    assert manager.get_repository_status(repo)["has_changes"]
+
+
+@requires_git
+def test_status_of_detached_head(git_repo):
+    repo, run = git_repo
+    run("checkout", "-q", "--detach")
+    status = GitManager(dry_run=False).get_repository_status(repo)
+    assert status["branch"] == "HEAD"
+    assert status["commit"] == head(repo)[:8]
+
+
+@requires_git
+def test_status_without_commits_or_repository(tmp_path):
+    manager = GitManager(dry_run=False)
+    empty = tmp_path / "empty"
+    empty.mkdir()
+    assert manager.get_repository_status(empty) is None
+    
+    subprocess.run(["git", "init", "-q", str(empty)], check=True)
+    assert manager.get_repository_status(empty) is None
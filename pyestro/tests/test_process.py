@@ -0,0 +1,65 @@
+"""
+Tests for the subprocess helpers.
+"""
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+from pyestro.core.process import iter_output_lines, run_json, run_keeping_stderr_tail
+
+
+def python(code):
+    """Build a command running a snippet with the current interpreter."""
+    return [sys.executable, "-c", code]
+
+
+def test_run_json_parses_stdout():
+    assert run_json(python('print(\'{"nodes": {"web01": [1, 2]}}\')')) == {"nodes": {"web01": [1, 2]}}
+
+
+def test_run_json_raises_with_decoded_stderr():
+    with pytest.raises(subprocess.CalledProcessError) as excinfo:
+        run_json(python("import sys; sys.stderr.write('no inventory'); sys.exit(3)"))
+    assert excinfo.value.returncode == 3
+    assert excinfo.value.stderr == "no inventory"
+
+
+def test_run_json_rejects_invalid_output():
+    with pytest.raises(json.JSONDecodeError):
+        run_json(python("print('not json')"))
+
+
+def test_iter_output_lines_streams_stdout():
+    lines = iter_output_lines(python("print('one'); print('two')"))
+    assert list(lines) == ["one\n", "two\n"]
+
+
+def test_iter_output_lines_survives_chatty_stderr():
+    # Far more stderr than a pipe buffer holds must not block the child
+    code = "import sys; sys.stderr.write('x' * (1 << 20)); print('done')"
+    assert list(iter_output_lines(python(code), check=True)) == ["done\n"]
+
+
+def test_iter_output_lines_check_raises_after_output():
+    code = "import sys; print('partial'); sys.stderr.write('boom'); sys.exit(2)"
+    lines = []
+    with pytest.raises(subprocess.CalledProcessError) as excinfo:
+        for line in iter_output_lines(python(code), check=True):
+            lines.append(line)
+    assert lines == ["partial\n"]
+    assert excinfo.value.returncode == 2
+    assert excinfo.value.stderr == "boom"
+
+
+def test_iter_output_lines_ignores_exit_status_by_default():
+    assert list(iter_output_lines(python("print('ok'); raise SystemExit(1)"))) == ["ok\n"]
+
+
+def test_run_keeping_stderr_tail_keeps_last_lines():
+    code = "import sys\nfor i in range(50): print(i); print(f'err{i}', file=sys.stderr)\nsys.exit(4)"
+    returncode, tail = run_keeping_stderr_tail(python(code), max_lines=3)
+    assert returncode == 4
+    assert tail == "err47\nerr48\nerr49\n"
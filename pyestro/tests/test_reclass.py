@@ -0,0 +1,59 @@
+"""
+Tests for the ReclassParser bulk inventory render.
+"""
+
+import json
+
+import pytest
+
+from pyestro.core.reclass import ReclassParser
+
+NODES = {
+    "web01": {"classes": ["web"], "parameters": {"port": 80}},
+    "db01": {"classes": ["db"], "parameters": {"port": 5432}},
+}
+
+
+@pytest.fixture
+def inventory_dir(tmp_path):
+    """A minimal inventory tree on disk."""
+    for name in NODES:
+        (tmp_path / "nodes").mkdir(exist_ok=True)
+        (tmp_path / "nodes" / f"{name}.yml").write_text("classes: []\n")
+    (tmp_path / "classes").mkdir()
+    return tmp_path
+
+
+def make_parser(inventory_dir, script):
+    parser = ReclassParser(inventory_dir, dry_run=False)
+    parser.reclass_path = str(script)
+    return parser
+
+
+def test_inventory_rendered_once_with_output_flag(make_script, invocations, inventory_dir):
+    script = make_script("reclass", f"echo '{json.dumps({'nodes': NODES})}'")
+    parser = make_parser(inventory_dir, script)
+    
+    assert parser.list_nodes() == ["db01", "web01"]
+    assert parser.search_parameter("port") == {"db01": 5432, "web01": 80}
+    assert parser.get_node_parameters("web01") == {"port": 80}
+    
+    assert invocations(script) == [f"-b {inventory_dir} --inventory --output json"]
+
+
+def test_failed_inventory_render_is_remembered(make_script, invocations, inventory_dir):
+    body = (
+        'case "$*" in\n'
+        '  *--inventory*) echo "unsupported" >&2; exit 2 ;;\n'
+        '  *) echo \'{"parameters": {"port": 1}, "classes": []}\' ;;\n'
+        'esac'
+    )
+    script = make_script("reclass", body)
+    parser = make_parser(inventory_dir, script)
+    
+    assert parser.search_parameter("port") == {"db01": 1, "web01": 1}
+    assert parser.list_nodes() == ["db01", "web01"]
+    
+    calls = invocations(script)
+    assert len([line for line in calls if "--inventory" in line]) == 1
+    assert all(line.endswith("--output json") for line in calls)
@@ -0,0 +1,159 @@
+"""
+Tests for the ReclassManager caches.
+"""
+
+import json
+
+import pytest
+
+from pyestro.core import config
+from pyestro.core.config import LOG_INFO, LOG_WARNING
+from pyestro.parsers.reclass_parser import ReclassManager
+
+INVENTORY = {
+    "nodes": {
+        "web01": {"classes": ["web", "base"], "parameters": {"project": "shop", "nginx": {"port": 80}}},
+        "web02": {"classes": ["web", "base"], "parameters": {"project": "blog", "nginx": {"port": 8080}}},
+        "db01": {"classes": ["base"], "parameters": {"project": "shop"}},
+    },
+    "classes": {"web": ["web01", "web02"], "base": ["web01", "web02", "db01"]},
+}
+
+
+@pytest.fixture
+def reclass(make_script, tmp_path):
+    """A ReclassManager driven by a fake reclass that renders INVENTORY."""
+    body = (
+        'case "$*" in\n'
+        f"  *--inventory*) echo '{json.dumps(INVENTORY)}' ;;\n"
+        '  *) echo \'{"parameters": {"single": true}, "classes": []}\' ;;\n'
+        'esac'
+    )
+    script = make_script("reclass", body)
+    manager = ReclassManager(tmp_path, dry_run=False)
+    manager.reclass_path = str(script)
+    return manager, script
+
+
+@pytest.fixture
+def inventory_runs(invocations):
+    """Return a helper listing the `reclass --inventory` runs of a script."""
+    return lambda script: [line for line in invocations(script) if "--inventory" in line]
+
+
+def test_inventory_is_rendered_once(reclass, inventory_runs):
+    manager, script = reclass
+    assert manager.list_nodes() == ["web01", "web02", "db01"]
+    assert sorted(manager.list_classes()) == ["base", "web"]
+    assert manager.get_nodes_by_class("web") == ["web01", "web02"]
+    assert manager.search_parameter("nginx:port") == {"web01": 80, "web02": 8080}
+    assert manager.filter_nodes(node_filter="web*", project_filter="shop") == ["web01"]
+    assert len(inventory_runs(script)) == 1
+
+
+def test_invalidate_cache_rerenders(reclass, invocations, inventory_runs):
+    manager, script = reclass
+    manager.get_node_data("web01")
+    manager.list_nodes()
+    manager.invalidate_cache()
+    manager.get_node_data("web01")
+    manager.list_nodes()
+    assert len(inventory_runs(script)) == 2
+    assert len([line for line in invocations(script) if "-n web01" in line]) == 2
+
+
+def test_filter_results_are_copies(reclass):
+    manager, _ = reclass
+    first = manager.filter_nodes(class_filter="base")
+    first.append("bogus")
+    assert manager.filter_nodes(class_filter="base") == ["db01", "web01", "web02"]
+
+
+def test_search_parameter_keeps_colon_keys_apart(reclass):
+    manager, _ = reclass
+    manager._inventory_cache = {"nodes": {"n1": {"parameters": {"a:b": 1, "a": {"b": 2}}}}}
+    assert manager.search_parameter("a:b") == {"n1": 2}
+
+
+def test_prefetch_after_repeated_misses(reclass, invocations, inventory_runs):
+    manager, script = reclass
+    for _ in range(manager.PREFETCH_AFTER_MISSES):
+        assert manager.get_node_data("web01") is not None
+        manager._node_cache.clear()
+    assert manager.get_node_parameters("web02") == INVENTORY["nodes"]["web02"]["parameters"]
+    assert manager.get_node_parameters("db01") == INVENTORY["nodes"]["db01"]["parameters"]
+    assert len(inventory_runs(script)) == 1
+    assert not any("-n db01" in line for line in invocations(script))
+
+
+def test_node_lookups_reuse_loaded_inventory(reclass, invocations):
+    manager, script = reclass
+    assert manager.filter_nodes(class_filter="web") == ["web01", "web02"]
+    for node in ["web01", "web02", "db01", "web01"]:
+        assert manager.get_node_data(node) == INVENTORY["nodes"][node]
+    assert len(invocations(script)) == 1
+
+
+def test_failed_prefetch_is_not_retried(make_script, tmp_path, inventory_runs):
+    body = (
+        'case "$*" in\n'
+        '  *--inventory*) echo "broken" >&2; exit 1 ;;\n'
+        '  *) echo \'{"parameters": {}, "classes": []}\' ;;\n'
+        'esac'
+    )
+    script = make_script("reclass", body)
+    manager = ReclassManager(tmp_path, dry_run=False)
+    manager.reclass_path = str(script)
+    
+    for i in range(manager.PREFETCH_AFTER_MISSES + 5):
+        assert manager.get_node_data(f"node{i}") is not None
+    
+    assert len(inventory_runs(script)) == 1
+    
+    # A fresh start after invalidation may try the bulk render again
+    manager.invalidate_cache()
+    for i in range(manager.PREFETCH_AFTER_MISSES + 2):
+        manager.get_node_data(f"other{i}")
+    assert len(inventory_runs(script)) == 2
+
+
+def test_get_many_node_data_validates_and_deduplicates(reclass, invocations):
+    manager, script = reclass
+    result = manager.get_many_node_data(["web01", " web01", "bad;name", "web02"])
+    assert list(result) == ["web01", "web02"]
+    assert len(invocations(script)) == 2
+
+
+def test_get_many_node_data_prefetches_many_names(reclass, invocations):
+    manager, script = reclass
+    names = ["web01", "web02", "db01", "web01", "db01"]
+    manager.PREFETCH_AFTER_MISSES = 2
+    result = manager.get_many_node_data(names)
+    assert result == {node: INVENTORY["nodes"][node] for node in ["web01", "web02", "db01"]}
+    assert [line.split()[2] for line in invocations(script)] == ["--inventory"]
+
+
+def test_dry_run_does_not_execute(make_script, tmp_path, invocations):
+    script = make_script("reclass", "exit 1")
+    manager = ReclassManager(tmp_path, dry_run=True)
+    manager.reclass_path = str(script)
+    assert manager.list_nodes() == []
+    assert manager.get_node_data("web01") == {"parameters": {}, "classes": [], "applications": []}
+    assert invocations(script) == []
+
+
+def test_dry_run_logs_quoted_commands_unless_quiet(make_script, tmp_path, capsys):
+    script = make_script("reclass", "exit 1")
+    manager = ReclassManager(tmp_path / "my inventory", dry_run=True)
+    manager.reclass_path = str(script)
+    
+    manager.get_node_data("web01")
+    assert f"-b '{tmp_path}/my inventory' -n web01" in capsys.readouterr().out
+    
+    config.set_log_level(LOG_WARNING)
+    try:
+        manager.get_node_data("web02")
+        manager.list_nodes()
+    finally:
+        config.set_log_level(LOG_INFO)
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,54 @@
+"""
+Tests for template discovery in the TemplateEngine.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from pyestro.core.templates import TemplateEngine
+
+
+def test_template_list_sees_template_json_added_later(tmp_path):
+    (tmp_path / "basic").mkdir()
+    (tmp_path / "basic" / "template.json").write_text('{"description": "Basic"}')
+    (tmp_path / "draft").mkdir()
+    engine = TemplateEngine(tmp_path)
+    
+    assert engine.get_available_templates() == ["basic"]
+    
+    # Keep the parent's mtime unchanged; only the draft directory changes
+    parent_mtime = os.stat(tmp_path).st_mtime_ns
+    (tmp_path / "draft" / "template.json").write_text('{"description": "Draft"}')
+    os.utime(tmp_path, ns=(parent_mtime, parent_mtime))
+    
+    assert engine.get_available_templates() == ["basic", "draft"]
+    assert engine.get_template_info("draft") == {"description": "Draft"}
+
+
+def test_template_list_drops_removed_template_json(tmp_path):
+    (tmp_path / "basic").mkdir()
+    (tmp_path / "basic" / "template.json").write_text("{}")
+    engine = TemplateEngine(tmp_path)
+    
+    assert engine.get_available_templates() == ["basic"]
+    
+    (tmp_path / "basic" / "template.json").unlink()
+    
+    assert engine.get_available_templates() == []
+
+
+def test_listing_templates_does_not_import_jinja2(tmp_path):
+    # A jinja2 that fails on import proves listing never touches it
+    (tmp_path / "jinja2").mkdir()
+    (tmp_path / "jinja2" / "__init__.py").write_text("raise RuntimeError('jinja2 was imported')\n")
+    package_root = Path(__file__).resolve().parent.parent
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([str(tmp_path), str(package_root)])}
+    
+    result = subprocess.run(
+        [sys.executable, "-c", "from pyestro.cli.main import cli; cli()", "create", "--list"],
+        cwd=tmp_path, env=env, capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stderr
+    assert "Available project templates:" in result.stdout
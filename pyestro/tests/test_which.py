@@ -0,0 +1,51 @@
+"""
+Tests for executable discovery.
+"""
+
+import os
+
+import pytest
+
+from pyestro.core.which import find_executables
+
+
+@pytest.fixture
+def search_path(tmp_path, monkeypatch):
+    """Two PATH directories with a mix of executables, plain files and directories."""
+    first = tmp_path / "first"
+    second = tmp_path / "second"
+    for directory in (first, second):
+        directory.mkdir()
+    for path, mode in [
+        (first / "git", 0o755),
+        (second / "git", 0o755),
+        (first / "rsync", 0o644),
+        (second / "rsync", 0o755),
+    ]:
+        path.write_text("#!/bin/sh\n")
+        path.chmod(mode)
+    (first / "reclass").mkdir()
+    monkeypatch.setenv("PATH", os.pathsep.join([str(first), "", str(second)]))
+    return first, second
+
+
+def test_first_executable_on_path_wins(search_path):
+    first, second = search_path
+    assert find_executables(["git", "rsync"]) == {
+        "git": str(first / "git"),
+        "rsync": str(second / "rsync"),
+    }
+
+
+def test_missing_names_map_to_none_in_order(search_path):
+    result = find_executables(["reclass", "git", "ansible"])
+    assert list(result) == ["reclass", "git", "ansible"]
+    assert result["reclass"] is None
+    assert result["ansible"] is None
+
+
+def test_results_follow_path_changes(search_path, monkeypatch):
+    _, second = search_path
+    assert find_executables(["git"])["git"] != str(second / "git")
+    monkeypatch.setenv("PATH", str(second))
+    assert find_executables(["git"]) == {"git": str(second / "git")}